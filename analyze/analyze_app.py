@@ -7,9 +7,26 @@ from analyze.signal_analysis import signal_distribution_analysis, financial_metr
 
 st.title('Sinyal Analiz Paneli')
 
-# 1. Run klasörü seçimi
+# 0. Run kataloğu: filtrelenmiş lider tablosu (outputs/catalog.sqlite), yalnızca ek görünüm
 outputs_dir = 'outputs'
+catalog_path = os.path.join(outputs_dir, 'catalog.sqlite')
 run_dirs = [d for d in os.listdir(outputs_dir) if os.path.isdir(os.path.join(outputs_dir, d))]
+if os.path.exists(catalog_path):
+    from src.pipelines.run_catalog import RunCatalog
+    catalog = RunCatalog(catalog_path)
+    st.subheader('Run Kataloğu')
+    col1, col2, col3 = st.columns(3)
+    metric = col1.selectbox('Sıralama metriği:', ['f1', 'accuracy', 'precision', 'recall', 'sharpe', 'cum_strategy_return'])
+    symbol = col2.text_input('Sembol filtresi (boş: hepsi):')
+    limit = col3.number_input('Gösterilecek run sayısı:', min_value=5, max_value=1000, value=20)
+    board = catalog.leaderboard(metric, limit=int(limit), filters=[('symbol', '=', symbol)] if symbol else None)
+    st.dataframe(board)
+    # Seçim listesi tüm run'ları kapsar: önce katalogdakiler (en yeni önce), sonra indekslenmemiş klasörler
+    folders = set(run_dirs)
+    indexed = [k for k in catalog.query(limit=None, columns=['run_key'])['run_key'] if k in folders]
+    run_dirs = indexed + sorted(folders - set(indexed))
+
+# 1. Run klasörü seçimi (tüm klasörler)
 selected_run = st.selectbox('Analiz etmek istediğiniz run klasörünü seçin:', run_dirs)
 run_path = os.path.join(outputs_dir, selected_run)
 
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.metrics import classification_report, confusion_matrix, mean_absolute_error
@@ -34,6 +35,13 @@ def signal_distribution_analysis(signals_path):
     ax2.legend()
     st.pyplot(fig2)
 
+# Monte Carlo testi pahalı: her Streamlit yeniden çiziminde değil, dosya değişince yeniden hesaplanır
+@st.cache_data(show_spinner='Monte Carlo testi çalışıyor...')
+def _monte_carlo_report(backtest_path, mtime, n_paths=2000):
+    from src.evaluation.monte_carlo import backtest_monte_carlo, monte_carlo_report
+    df = pd.read_csv(backtest_path)
+    return monte_carlo_report(backtest_monte_carlo(df, method='random_signal', n_paths=n_paths, seed=0))
+
 # Finansal metrikler ve trade simülasyonu (backtest.csv)
 def financial_metrics_analysis(backtest_path):
     df = pd.read_csv(backtest_path)
@@ -49,6 +57,10 @@ def financial_metrics_analysis(backtest_path):
     if 'strategy_return' in df.columns:
         sharpe = df['strategy_return'].mean() / (df['strategy_return'].std() + 1e-8)
         st.write(f"Sharpe Oranı (basit): {sharpe:.4f}")
+    # Monte Carlo anlamlılık testi (şans mı, beceri mi?)
+    if {'strategy_return', 'return', 'shifted_signal'} <= set(df.columns):
+        st.subheader('Monte Carlo Anlamlılık Testi (rastgele sinyal, 2000 path)')
+        st.dataframe(_monte_carlo_report(backtest_path, os.path.getmtime(backtest_path)))
     st.line_chart(df['close'])
     st.caption('Fiyat serisi (close)')
 
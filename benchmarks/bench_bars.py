@@ -0,0 +1,44 @@
+"""
+Tick / volume / dollar bar throughput on a synthetic trade tape streamed in chunks (bounded memory).
+Kullanım: python benchmarks/bench_bars.py [--trades 20000000] [--chunk-size 1000000]
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import argparse
+import resource
+import time
+from src.data.bar_builder import BarBuilder
+from src.data.synthetic_trades import iter_synthetic_trades
+
+THRESHOLDS = {'tick': 1000, 'volume': 50.0, 'dollar': 1_500_000.0}
+
+
+def peak_rss_mb():
+    # Linux'ta ru_maxrss KB cinsinden
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bar builder benchmark")
+    parser.add_argument('--trades', type=int, default=20_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for bar_type, threshold in THRESHOLDS.items():
+        builder = BarBuilder(bar_type, threshold)
+        n_bars, build_time = 0, 0.0
+        t0 = time.perf_counter()
+        for ts, price, amount in iter_synthetic_trades(args.trades, chunk_size=args.chunk_size, seed=0):
+            t1 = time.perf_counter()
+            n_bars += len(builder.update(ts, price, amount))
+            build_time += time.perf_counter() - t1
+        n_bars += len(builder.flush())
+        elapsed = time.perf_counter() - t0
+        print(f"{bar_type} (threshold={threshold}): {args.trades} trades -> {n_bars} bars, "
+              f"build {build_time:.2f} s ({args.trades / build_time / 1e6:.1f} M trades/s), "
+              f"total incl. generation {elapsed:.2f} s, peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
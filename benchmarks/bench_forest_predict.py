@@ -0,0 +1,50 @@
+"""
+Single-bar / small-batch latency: sklearn predict vs compiled FlatForestPredictor.
+Kullanım: python benchmarks/bench_forest_predict.py [--trees 100] [--features 30] [--repeats 200]
+"""
+import sys, os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import argparse
+import time
+import numpy as np
+from src.models.model_factory import get_model
+
+
+def _latency(fn, X, repeats):
+    fn(X)  # ısınma
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1e3, np.percentile(times, 99) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forest predict latency benchmark")
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--features', type=int, default=30)
+    parser.add_argument('--train-rows', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.train_rows, args.features))
+    y = np.sign(X[:, 0] + 0.3 * rng.normal(size=args.train_rows)).astype(int)
+    model = get_model('random_forest', n_estimators=args.trees, random_state=0).fit(X, y)
+    t0 = time.perf_counter()
+    flat = model.compile()
+    print(f"compile: {(time.perf_counter() - t0) * 1e3:.1f} ms, max_depth={flat.max_depth}")
+
+    print(f"{'rows':>6} {'sklearn p50/p99 ms':>22} {'flat p50/p99 ms':>20} {'speedup':>8} {'identical':>10}")
+    for rows in (1, 10, 100):
+        Xq = rng.normal(size=(rows, args.features))
+        sk = _latency(lambda a: model.predict(a, backend='sklearn'), Xq, args.repeats)
+        fl = _latency(lambda a: model.predict(a, backend='flat'), Xq, args.repeats)
+        same = np.array_equal(model.predict(Xq, backend='sklearn'), model.predict(Xq, backend='flat'))
+        print(f"{rows:>6} {sk[0]:>10.3f} / {sk[1]:<9.3f} {fl[0]:>8.3f} / {fl[1]:<9.3f} {sk[0] / fl[0]:>7.1f}x {str(same):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+CLI startup time, measured with `python -X importtime`.
+For each command it reports the total import time, wall time and which heavy libraries were loaded.
+Results can be written to JSON and checked against a budget to track regressions.
+Kullanım: python benchmarks/bench_startup.py [--repeats 5] [--json startup.json] [--budget-ms 300]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/../')
+HEAVY_MODULES = ('pandas', 'numpy', 'ccxt', 'sklearn', 'scipy', 'matplotlib', 'seaborn', 'streamlit')
+COMMANDS = {
+    'help': ['--help'],
+    'fetch --help': ['fetch', '--help'],
+    'run --help': ['run', '--help'],
+    'analyze --help': ['analyze', '--help'],
+}
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """Return (total_us, {top_level_module: cumulative_us}) from -X importtime output."""
+    top = {}
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m and len(m.group(3)) == 1:  # en üst seviye importlar
+            name = m.group(4)
+            top[name] = top.get(name, 0) + int(m.group(2))
+    return sum(top.values()), top
+
+
+def measure(args, repeats):
+    totals, walls, top = [], [], {}
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', 'main.py'] + args,
+                              cwd=ROOT, capture_output=True, text=True)
+        walls.append((time.perf_counter() - t0) * 1e3)
+        total, top = parse_importtime(proc.stderr)
+        totals.append(total / 1e3)
+    heavy = sorted({m for name in top for m in HEAVY_MODULES if name == m or name.startswith(m + '.')})
+    slowest = sorted(top.items(), key=lambda kv: -kv[1])[:5]
+    return {'import_ms': statistics.median(totals), 'wall_ms': statistics.median(walls),
+            'heavy_modules': heavy, 'slowest': [(k, v / 1e3) for k, v in slowest]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail if any import time exceeds this')
+    args = parser.parse_args()
+
+    results = {}
+    for name, cmd in COMMANDS.items():
+        res = results[name] = measure(cmd, args.repeats)
+        print(f"{name:<16} import {res['import_ms']:8.1f} ms   wall {res['wall_ms']:8.1f} ms   "
+              f"heavy: {', '.join(res['heavy_modules']) or '-'}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.budget_ms is not None:
+        over = [n for n, r in results.items() if r['import_ms'] > args.budget_ms]
+        if over:
+            print(f"Over budget ({args.budget_ms} ms): {', '.join(over)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Aminogli Signal Reloaded - unified command line interface.
+
+Subcommands: fetch, run, batch, analyze, serve, live, catalog.
+Heavy libraries (pandas, ccxt, scikit-learn, plotting) are imported inside the subcommand that needs them,
+so `--help` and light commands start fast and importing this module has no side effects.
+"""
+import argparse
+import os
+import sys
+
+SUBCOMMANDS = ('fetch', 'run', 'batch', 'analyze', 'serve', 'live', 'catalog')
+DEFAULT_CONFIG = os.path.join('configs', 'default_config.yaml')
+
+
+def _parse_since(value):
+    if value is None:
+        return None
+    # ISO formatı veya timestamp desteği
+    if value.isdigit():
+        return int(value)
+    import pandas as pd
+    return int(pd.Timestamp(value).timestamp() * 1000)
+
+
+def _load_config(path):
+    import yaml
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"Config file is empty or not a mapping: {path}")
+    return config
+
+
+def cmd_fetch(args):
+    from src.data.data_fetcher import DataFetcher
+    from src.data.exchange_backends import create_backend
+
+    try:
+        since = _parse_since(args.since)
+    except Exception as e:
+        print(f"Invalid --since value: {e}")
+        return 2
+    mode = 'replay' if args.replay else ('record' if args.record else 'live')
+    with create_backend(args.exchange, mode, args.replay or args.record) as backend:
+        fetcher = DataFetcher(args.exchange, backend=backend)
+        df = fetcher.fetch_data(args.symbol, args.timeframe, args.limit, since=since)
+    print(df.head())
+
+    # Kaydetme opsiyonu
+    if args.save:
+        symbol_safe = args.symbol.replace('/', '_')
+        out_dir = os.path.join('data', args.exchange, symbol_safe)
+        os.makedirs(out_dir, exist_ok=True)
+        out_path = os.path.join(out_dir, f"{args.timeframe}_ohlcv.csv")
+        df.to_csv(out_path, index=False)
+        print(f"Data saved to {out_path}")
+    return 0
+
+
+def _apply_overrides(config, args):
+    if args.exchange_mode:
+        config['exchange_mode'] = args.exchange_mode
+    if args.cassette:
+        config['exchange_cassette'] = args.cassette
+    return config
+
+
+def cmd_run(args):
+    from src.pipelines.full_pipeline import run_full_pipeline
+    config = _apply_overrides(_load_config(args.config), args)
+    # run_full_pipeline aşama hatalarını loglayıp None döner
+    if run_full_pipeline(config) is None:
+        print("Pipeline failed (see the log for the failing stage)")
+        return 1
+    return 0
+
+
+def cmd_batch(args):
+    from src.pipelines.full_pipeline import run_full_pipeline
+    paths = []
+    for path in args.configs:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(('.yaml', '.yml'))))
+        else:
+            paths.append(path)
+    failed = 0
+    for i, path in enumerate(paths, 1):
+        print(f"[{i}/{len(paths)}] {path}")
+        try:
+            if run_full_pipeline(_apply_overrides(_load_config(path), args)) is None:
+                raise RuntimeError("pipeline stage failed (see the log)")
+        except Exception as e:
+            failed += 1
+            print(f"  failed: {e}")
+            if args.fail_fast:
+                break
+    print(f"Batch finished: {len(paths) - failed} ok, {failed} failed")
+    return 1 if failed else 0
+
+
+def cmd_analyze(args):
+    import pandas as pd
+    run_dir = args.run_dir
+    metrics_path = os.path.join(run_dir, 'metrics.csv')
+    backtest_path = os.path.join(run_dir, 'backtest.csv')
+    if not os.path.isdir(run_dir):
+        print(f"Run directory not found: {run_dir}")
+        return 2
+    if os.path.exists(metrics_path):
+        print('Metrics:')
+        print(pd.read_csv(metrics_path).to_string(index=False))
+    if os.path.exists(backtest_path):
+        backtest = pd.read_csv(backtest_path)
+        if 'cum_strategy_return' in backtest.columns:
+            print(f"Cumulative strategy return: {backtest['cum_strategy_return'].iloc[-1]:.4f}")
+        if args.monte_carlo:
+            from src.evaluation.monte_carlo import backtest_monte_carlo, monte_carlo_report
+            result = backtest_monte_carlo(backtest, method=args.mc_method, n_paths=args.monte_carlo, seed=args.seed)
+            print(f"Monte Carlo ({args.mc_method}, {args.monte_carlo} paths):")
+            print(monte_carlo_report(result).to_string())
+    return 0
+
+
+def cmd_serve(args):
+    import subprocess
+    app = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analyze', 'analyze_app.py')
+    cmd = [sys.executable, '-m', 'streamlit', 'run', app, '--server.port', str(args.port)]
+    return subprocess.call(cmd)
+
+
+def cmd_live(args):
+    from src.data.data_fetcher import DataFetcher
+    from src.data.exchange_backends import create_backend, SyntheticExchangeBackend
+    from src.pipelines.live_loop import LiveSignalLoop, SimulatedClock, SystemClock, load_run_model, load_run_processor
+
+    config = _load_config(args.config)
+    streams = [tuple(s.rsplit(':', 1)) for s in args.stream] or [(config['symbol'], config['timeframe'])]
+    if args.simulate:
+        # Çevrimdışı deneme: sentetik borsa + simüle saat
+        import time
+        clock = SimulatedClock(time.time() * 1000)
+        backend = SyntheticExchangeBackend(now_fn=clock.now_ms)
+    else:
+        clock = SystemClock()
+        backend = create_backend(config['exchange'], config.get('exchange_mode', 'live'), config.get('exchange_cassette'))
+    loop = LiveSignalLoop(DataFetcher(config['exchange'], backend=backend), load_run_model(args.run_dir, args.backend),
+                          streams, process_steps=config['process_steps'], process_params=config['process_params'],
+                          model_name=config.get('model_name', 'random_forest'), clock=clock, warmup=args.warmup,
+                          processor=load_run_processor(args.run_dir))
+    try:
+        loop.run_forever(max_ticks=args.max_ticks)
+    finally:
+        backend.close()
+    ticks = loop.latency_frame()
+    if not ticks.empty:
+        print(ticks.groupby(['symbol', 'timeframe'])[['latency_ms', 'processing_ms']].describe().to_string())
+    return 0
+
+
+def cmd_catalog(args):
+    import pandas as pd
+    from src.pipelines.run_catalog import RunCatalog, RunCatalogException
+    catalog = RunCatalog(args.db)
+    if args.action == 'backfill':
+        count = catalog.backfill(args.outputs, force=args.force)
+        print(f"Indexed {count} runs into {args.db}")
+        return 0
+    try:
+        if args.action == 'leaderboard':
+            df = catalog.leaderboard(args.metric, limit=args.limit, filters=args.where)
+        else:
+            df = catalog.query(filters=args.where, order_by=args.order_by, descending=not args.asc, limit=args.limit)
+    except RunCatalogException as e:
+        print(f"Invalid catalog query: {e}")
+        return 2
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(df.to_string(index=False) if not df.empty else 'No runs found.')
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Aminogli Signal Reloaded - Main Entry Point")
+    sub = parser.add_subparsers(dest='command', metavar='{' + ','.join(SUBCOMMANDS) + '}')
+
+    p = sub.add_parser('fetch', help='Fetch OHLCV data')
+    p.add_argument('--exchange', type=str, default='binance', help='Exchange name (default: binance)')
+    p.add_argument('--symbol', type=str, default='BTC/USDT', help='Trading pair symbol (default: BTC/USDT)')
+    p.add_argument('--timeframe', type=str, default='1h', help='Timeframe (default: 1h)')
+    p.add_argument('--limit', type=int, default=100, help='Number of data points to fetch (default: 100)')
+    p.add_argument('--since', type=str, default=None, help='Start date/time (ISO format or timestamp in ms)')
+    p.add_argument('--save', action='store_true', help='Save fetched data to file')
+    p.add_argument('--record', type=str, default=None, help='Record exchange responses to this cassette (.npz)')
+    p.add_argument('--replay', type=str, default=None, help='Replay exchange responses from this cassette (offline)')
+    p.set_defaults(func=cmd_fetch)
+
+    for name, func, help_text in (('run', cmd_run, 'Run the full pipeline for one config'),
+                                  ('batch', cmd_batch, 'Run the full pipeline for many configs')):
+        p = sub.add_parser(name, help=help_text)
+        if name == 'run':
+            p.add_argument('--config', type=str, default=DEFAULT_CONFIG, help=f'YAML config (default: {DEFAULT_CONFIG})')
+        else:
+            p.add_argument('configs', nargs='+', help='YAML config files or directories')
+            p.add_argument('--fail-fast', action='store_true', help='Stop at the first failing config')
+        p.add_argument('--exchange-mode', choices=['live', 'record', 'replay'], default=None, help='Override exchange_mode')
+        p.add_argument('--cassette', type=str, default=None, help='Override exchange_cassette')
+        p.set_defaults(func=func)
+
+    p = sub.add_parser('analyze', help='Summarize a run directory (outputs/<model>_<run_id>)')
+    p.add_argument('run_dir', help='Run directory')
+    p.add_argument('--monte-carlo', type=int, default=0, metavar='N', help='Run a Monte Carlo test with N paths')
+    p.add_argument('--mc-method', choices=['block_bootstrap', 'random_signal'], default='random_signal')
+    p.add_argument('--seed', type=int, default=0)
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser('serve', help='Start the Streamlit analysis panel')
+    p.add_argument('--port', type=int, default=8501)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('live', help='Run the bar-close aligned live signal loop')
+    p.add_argument('--run-dir', required=True, help='Run directory with model.pkl (outputs/<model>_<run_id>)')
+    p.add_argument('--config', type=str, default=DEFAULT_CONFIG, help='Config used for training (processing steps)')
+    p.add_argument('--stream', action='append', default=[], metavar='SYMBOL:TIMEFRAME',
+                   help='Stream to score, repeatable (default: config symbol/timeframe)')
+    p.add_argument('--max-ticks', type=int, default=None, help='Stop after N bar closes')
+    p.add_argument('--warmup', type=int, default=None,
+                   help="Bars kept per stream for features (default: the processing steps' lookback)")
+    p.add_argument('--backend', choices=['flat', 'sklearn'], default='flat', help='Model predict backend')
+    p.add_argument('--simulate', action='store_true', help='Synthetic exchange and simulated clock (offline)')
+    p.set_defaults(func=cmd_live)
+
+    p = sub.add_parser('catalog', help='Query the run catalog (list, leaderboard, backfill)')
+    p.add_argument('action', choices=['list', 'leaderboard', 'backfill'])
+    p.add_argument('--db', type=str, default=os.path.join('outputs', 'catalog.sqlite'), help='Catalog database')
+    p.add_argument('--where', action='append', default=[], metavar='EXPR',
+                   help="Filter, repeatable: 'f1>=0.4', 'symbol=BTC/USDT', 'model_name~forest'")
+    p.add_argument('--order-by', type=str, default='created_at', help='Sort column for list (default: created_at)')
+    p.add_argument('--asc', action='store_true', help='Ascending sort for list')
+    p.add_argument('--metric', type=str, default='f1', help='Leaderboard metric (default: f1)')
+    p.add_argument('--limit', type=int, default=20)
+    p.add_argument('--outputs', type=str, default='outputs', help='Outputs directory for backfill')
+    p.add_argument('--force', action='store_true', help='Re-index runs already in the catalog')
+    p.set_defaults(func=cmd_catalog)
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Geriye uyumluluk: eski `main.py` ve `main.py --symbol ...` çağrıları fetch'e yönlenir
+    if not argv or (argv[0].startswith('--') and argv[0] != '--help'):
+        argv.insert(0, 'fetch')
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return 0
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
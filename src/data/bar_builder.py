@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+BAR_TYPES = ('tick', 'volume', 'dollar')
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+class BarBuilder:
+    """
+    Streaming, vectorized builder for information-driven bars (tick, volume, dollar) from raw trades.
+    Trade i belongs to bar floor(C_{i-1} / threshold), where C is the running trade count / volume /
+    dollar value, so a bar closes with the trade that pushes it over the threshold. Each update is a
+    single pass of cumsum + reduceat over the chunk; between chunks only the still-open bar's aggregate
+    (first timestamp, open, high, low, close, volume) and its accumulated measure are kept, so memory is
+    bounded by the chunk size however many chunks a bar spans.
+    Output uses the fetch_data OHLCV schema (timestamp = first trade of the bar), so DataProcessor and
+    the label generators work on it unchanged.
+    """
+    def __init__(self, bar_type='volume', threshold=100.0):
+        """
+        :param bar_type: 'tick' (trade count), 'volume' (base amount) or 'dollar' (price * amount).
+        :param threshold: Trades / volume / dollar value per bar.
+        """
+        if bar_type not in BAR_TYPES:
+            raise ValueError(f"Unknown bar type: {bar_type}")
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+        self.bar_type = bar_type
+        self.threshold = float(threshold)
+        self._open = None  # açık barın özeti (OHLCV kolonları -> skaler)
+        self._base = 0.0  # açık bara şimdiye kadar biriken ölçü, [0, threshold)
+
+    def _measure(self, price, amount):
+        if self.bar_type == 'tick':
+            return np.ones(len(price))
+        if self.bar_type == 'volume':
+            return amount
+        return price * amount
+
+    def update(self, timestamps, prices, amounts):
+        """Add a chunk of trades (sorted by time); returns the bars completed by this chunk as a DataFrame."""
+        ts = np.asarray(timestamps, dtype=np.int64)
+        price = np.asarray(prices, dtype=np.float64)
+        amount = np.asarray(amounts, dtype=np.float64)
+        if len(ts) == 0:
+            return _empty_bars()
+        cum = np.cumsum(self._measure(price, amount))
+        cum += self._base
+        # Her işlemden ÖNCEKİ birikimli ölçü; ilk işlem her zaman açık bara (id 0) düşer
+        cum_before = np.r_[self._base, cum[:-1]]
+        ids = np.floor(cum_before / self.threshold).astype(np.int64)
+        bars = _aggregate(ts, price, amount, ids)
+        if self._open is not None:
+            # Önceki parçalardan açık kalan bar bu parçanın ilk barıyla birleşir
+            prev = self._open
+            bars['timestamp'][0] = prev['timestamp']
+            bars['open'][0] = prev['open']
+            bars['high'][0] = max(bars['high'][0], prev['high'])
+            bars['low'][0] = min(bars['low'][0], prev['low'])
+            bars['volume'][0] += prev['volume']
+        closed = np.floor(cum[-1] / self.threshold)
+        self._base = float(cum[-1] - closed * self.threshold)
+        if closed > ids[-1]:
+            # Son işlem eşiği geçti: son bar da tamamlandı
+            self._open = None
+            return _frame(bars)
+        self._open = {k: v[-1] for k, v in bars.items()}
+        return _frame({k: v[:-1] for k, v in bars.items()})
+
+    def flush(self):
+        """Return the still-open (partial) bar, if any, and reset the builder."""
+        bars = _empty_bars() if self._open is None else _frame({k: np.array([v]) for k, v in self._open.items()})
+        self._open = None
+        self._base = 0.0
+        return bars
+
+
+def _empty_bars():
+    return pd.DataFrame({c: pd.Series(dtype='datetime64[ms]' if c == 'timestamp' else 'float64') for c in OHLCV_COLUMNS})
+
+
+def _aggregate(ts, price, amount, ids):
+    """OHLCV arrays per run of equal bar ids (timestamp as int ms)."""
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ts)]
+    return {
+        'timestamp': ts[starts],
+        'open': price[starts],
+        'high': np.maximum.reduceat(price, starts),
+        'low': np.minimum.reduceat(price, starts),
+        'close': price[ends - 1],
+        'volume': np.add.reduceat(amount, starts),
+    }
+
+
+def _frame(bars):
+    if len(bars['timestamp']) == 0:
+        return _empty_bars()
+    return pd.DataFrame({'timestamp': pd.to_datetime(bars['timestamp'], unit='ms'),
+                         **{c: bars[c] for c in OHLCV_COLUMNS[1:]}})
+
+
+def build_bars(timestamps, prices, amounts, bar_type='volume', threshold=100.0, include_partial=False):
+    """One-shot version of BarBuilder for trades already in memory."""
+    builder = BarBuilder(bar_type, threshold)
+    bars = builder.update(timestamps, prices, amounts)
+    if include_partial:
+        bars = pd.concat([bars, builder.flush()], ignore_index=True)
+    return bars
+
+
+def bars_from_chunks(chunks, bar_type='volume', threshold=100.0, include_partial=False):
+    """
+    Build bars from an iterable of (timestamp, price, amount) chunks, e.g. TradeStore.iter_chunks().
+    Only the completed bars of each chunk are kept, so memory is bounded by chunk size + bar count.
+    """
+    builder = BarBuilder(bar_type, threshold)
+    parts = [builder.update(*chunk) for chunk in chunks]
+    if include_partial:
+        parts.append(builder.flush())
+    parts = [p for p in parts if len(p)]
+    return pd.concat(parts, ignore_index=True) if parts else _empty_bars()
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# store = TradeStore.for_symbol('binance', 'BTC/USDT')
+# bars = bars_from_chunks(store.iter_chunks(), bar_type='dollar', threshold=5_000_000)
+# df = DataProcessor(['add_indicators']).process(bars, {'add_indicators': {'indicators': ['rsi', 'ema']}})
@@ -1,9 +1,11 @@
-import ccxt
 import pandas as pd
 import numpy as np
 from loguru import logger
 import os
 from abc import ABC, abstractmethod
+from .exchange_backends import create_backend
+from .trade_store import TradeStore
+from .bar_builder import bars_from_chunks
 
 class DataFetcherException(Exception):
     pass
@@ -14,16 +16,15 @@ class BaseDataFetcher(ABC):
         pass
 
 class DataFetcher(BaseDataFetcher):
-    def __init__(self, exchange_name):
+    def __init__(self, exchange_name, backend=None):
         """
         Initialize the DataFetcher with the given exchange name.
         :param exchange_name: Name of the exchange (e.g., 'binance', 'kraken').
+        :param backend: Optional exchange backend (e.g. ReplayBackend for offline runs). Default: live CCXT.
         """
-        try:
-            self.exchange = getattr(ccxt, exchange_name)()
-            logger.info(f"Exchange '{exchange_name}' initialized successfully.")
-        except AttributeError:
-            raise ValueError(f"Exchange '{exchange_name}' is not supported by CCXT.")
+        self.exchange_name = exchange_name
+        self.exchange = backend if backend is not None else create_backend(exchange_name)
+        logger.info(f"Exchange '{exchange_name}' initialized successfully ({type(self.exchange).__name__}).")
 
     def fetch_data(self, symbol, timeframe, limit=100, since=None, columns=None, as_type='df', save_path=None):
         """
@@ -74,8 +75,95 @@ class DataFetcher(BaseDataFetcher):
             since = int(last_timestamp)
         return self.fetch_data(symbol, timeframe, since=since, columns=columns, as_type=as_type, save_path=save_path)
 
+    def fetch_trades(self, symbol, since=None, limit=1000):
+        """
+        Fetch one page of raw trades.
+        :return: DataFrame with columns timestamp (int ms), price, amount.
+        """
+        try:
+            rows = self.exchange.fetch_trades(symbol, since=since, limit=limit)
+        except Exception as e:
+            logger.exception(f"Trade fetch failed! Symbol: {symbol}, Since: {since}, Limit: {limit}")
+            raise DataFetcherException(f"Failed to fetch trades for {symbol}: {e}") from e
+        return pd.DataFrame(rows, columns=['timestamp', 'price', 'amount']).astype(
+            {'timestamp': 'int64', 'price': 'float64', 'amount': 'float64'})
+
+    def download_trades(self, symbol, since=None, until=None, limit=1000, store=None, max_pages=None):
+        """
+        Paginate trade history into a local TradeStore (one chunk per page, bounded memory).
+        The store is append-only: when since is None or falls inside the stored range, the download resumes
+        after the last stored trade (including the rest of its millisecond).
+        :param until: Stop at this timestamp in ms (exclusive). Default: fetch until no new trades.
+        :param store: TradeStore (default: data/<exchange>/<symbol>/trades/).
+        :return: The TradeStore.
+        """
+        if store is None:
+            store = TradeStore.for_symbol(self.exchange_name, symbol)
+        cursor, seen_at_cursor = since, 0
+        last, n_last = store.boundary()
+        if last is not None and (since is None or since <= last):
+            # Kaldığı yerden devam: son milisaniyede saklanan işlemler atlanır
+            cursor, seen_at_cursor = (last, n_last) if n_last < limit else (last + 1, 0)
+        pages, total = 0, 0
+        while max_pages is None or pages < max_pages:
+            page = self.fetch_trades(symbol, since=cursor, limit=limit)
+            pages += 1
+            ts = page['timestamp'].to_numpy()
+            # Tam sayfanın hepsi tek milisaniyede: since/limit ile o milisaniyenin ötesine sayfalanamaz
+            stuck = cursor is not None and len(ts) >= limit and ts[0] == ts[-1] == cursor
+            # Önceki sayfanın son milisaniyesindeki işlemler tekrar gelir: atla
+            if cursor is not None and seen_at_cursor:
+                skip = min(seen_at_cursor, int(np.searchsorted(ts, cursor, side='right')))
+                page, ts = page.iloc[skip:], ts[skip:]
+            if until is not None:
+                keep = int(np.searchsorted(ts, until, side='left'))
+                done = keep < len(ts)
+                page, ts = page.iloc[:keep], ts[:keep]
+            else:
+                done = False
+            if len(ts):
+                store.append(ts, page['price'].to_numpy(), page['amount'].to_numpy())
+                total += len(ts)
+            if done:
+                break
+            if stuck:
+                # Tek milisaniyede limit'ten fazla işlem: ilerleyebilmek için bir ms atla
+                # (sayfa tekrarlardan ibaret olup boş kalsa bile)
+                logger.warning(f"More than {limit} trades at {cursor} ms; skipping ahead.")
+                cursor, seen_at_cursor = cursor + 1, 0
+            elif len(ts) == 0:
+                break
+            else:
+                # Son milisaniyede saklanan toplam işlem (önceki sayfalardakiler dahil)
+                seen_at_cursor = int(np.count_nonzero(ts == ts[-1])) + (seen_at_cursor if ts[-1] == cursor else 0)
+                cursor = int(ts[-1])
+        logger.info(f"Downloaded {total} trades for {symbol} in {pages} pages into {store.root}.")
+        return store
+
+    def fetch_bars(self, symbol, bar_type='volume', threshold=100.0, since=None, until=None, store=None,
+                   download=True, limit=1000, include_partial=False, as_type='df'):
+        """
+        Information-driven bars (tick / volume / dollar) built from raw trades, in the fetch_data OHLCV schema.
+        :param download: Fetch new trades into the store first (False: build from the local store only).
+        :param threshold: Trades / base volume / quote (dollar) value per bar.
+        """
+        if store is None:
+            store = TradeStore.for_symbol(self.exchange_name, symbol)
+        if download:
+            self.download_trades(symbol, since=since, until=until, limit=limit, store=store)
+        df = bars_from_chunks(store.iter_chunks(since=since, until=until), bar_type=bar_type,
+                              threshold=threshold, include_partial=include_partial)
+        logger.info(f"Built {len(df)} {bar_type} bars for {symbol} (threshold={threshold}).")
+        if as_type == 'np':
+            return df.values
+        elif as_type == 'dict':
+            return df.to_dict('records')
+        return df
+
 # Example usage (to be removed in production):
 # fetcher = DataFetcher('binance')
+# fetcher = DataFetcher('binance', backend=create_backend('binance', mode='replay', path='cassettes/btc_1h.npz'))
 # df = fetcher.fetch_data('BTC/USDT', '1h', limit=200, save_path='btc_1h.csv')
 # df_new = fetcher.fetch_latest('BTC/USDT', '1h', last_timestamp=df['timestamp'].iloc[-1])
+# bars = fetcher.fetch_bars('BTC/USDT', bar_type='dollar', threshold=5_000_000, since=df['timestamp'].iloc[0].value // 10**6)
 
@@ -1,8 +1,15 @@
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from loguru import logger
 import numpy as np
 from abc import ABC, abstractmethod
+from .lag_matrix import LagMatrix
+from .feature_bank import build_feature_bank, DEFAULT_WINDOWS, FEATURE_BANK_FAMILIES
+
+# EMA'nın başlangıç (tohum) etkisi EMA_WARMUP_SPANS span sonra ~(1 - 2/(s+1))**(4s) ≈ e^-8'e iner
+EMA_WARMUP_SPANS = 4
+# add_indicators'daki sabit pencerelerle (rsi/sma/volatility 14, ema 14, macd 12/26, momentum 4) aynı
+INDICATOR_LOOKBACK = {'rsi': 15, 'ema': EMA_WARMUP_SPANS * 14, 'sma': 14, 'macd': EMA_WARMUP_SPANS * 26,
+                      'volatility': 14, 'momentum': 5, 'rolling_mean': 14}
 
 class DataProcessingException(Exception):
     pass
@@ -13,8 +20,22 @@ class BaseDataProcessor(ABC):
         pass
 
 class DataProcessor(BaseDataProcessor):
-    def __init__(self, steps):
+    def __init__(self, steps, fitted=None):
         self.steps = steps  # Örn: ['fillna', 'scale', 'add_indicators', ...]
+        self.lag_matrix = None  # add_lagged_features(mode='matrix') sonucu
+        # Stateful adımların fit edilmiş nesneleri (örn. scaler); varsa yeniden fit edilmez, sadece transform
+        self.fitted = dict(fitted or {})
+
+    def save_state(self, path):
+        """Persist steps and fitted state (e.g. the scaler) so inference can reuse the training fit."""
+        import joblib
+        joblib.dump({'steps': list(self.steps), 'fitted': self.fitted}, path)
+
+    @classmethod
+    def load_state(cls, path):
+        import joblib
+        state = joblib.load(path)
+        return cls(state['steps'], fitted=state['fitted'])
 
     def process(self, df, params):
         for step in self.steps:
@@ -25,8 +46,48 @@ class DataProcessor(BaseDataProcessor):
                 raise DataProcessingException(f"Data processing failed at step '{step}' with params {params.get(step, {})}: {e}") from e
         return df
 
+    def lookback(self, params):
+        """
+        Number of bars (including the current one) the steps need so the last row's features are warmed up:
+        rolling windows and lags count as-is, EMAs (ema/macd) count EMA_WARMUP_SPANS spans.
+        Steps are chained (e.g. lags of indicators), so their lookbacks add up.
+        """
+        bars = 1
+        for step in self.steps:
+            bars += self._step_lookback(step, params.get(step, {})) - 1
+        return bars
+
+    @staticmethod
+    def _step_lookback(step, p):
+        if step == 'add_indicators':
+            return max([INDICATOR_LOOKBACK.get(ind, 1) for ind in p.get('indicators') or []], default=1)
+        if step == 'add_feature_bank':
+            windows = [int(w) for w in p.get('windows', DEFAULT_WINDOWS)]
+            need = [1]
+            for family in p.get('families', FEATURE_BANK_FAMILIES):
+                if family == 'ema':
+                    need += [EMA_WARMUP_SPANS * w for w in windows]
+                elif family == 'macd':
+                    pairs = p.get('macd_pairs')
+                    spans = windows if pairs is None else [int(s) for pair in pairs for s in pair]
+                    need += [EMA_WARMUP_SPANS * s for s in spans]
+                elif family in ('rsi', 'momentum'):
+                    need += [w + 1 for w in windows]
+                else:
+                    need += windows
+            return max(need)
+        if step == 'add_lagged_features':
+            lags = p.get('lags', 1)
+            return 1 + (int(lags) if np.isscalar(lags) else max(lags, default=0))
+        return 1
+
     def fillna(self, df, method='ffill'):
-        return df.fillna(method=method)
+        # fillna(method=...) pandas 3 ile kaldırıldı
+        if method in ('ffill', 'pad'):
+            return df.ffill()
+        if method in ('bfill', 'backfill'):
+            return df.bfill()
+        raise ValueError(f"Unknown fillna method: {method}")
 
     def remove_outliers(self, df, z_thresh=3):
         # Z-score ile outlier temizliği (sadece sayısal kolonlar)
@@ -37,9 +98,16 @@ class DataProcessor(BaseDataProcessor):
         return df[mask]
 
     def scale(self, df, scaler_type='minmax'):
+        if 'scale' in self.fitted:
+            # Eğitimde fit edilen scaler ile aynı ölçek (canlı/inference)
+            scaler, columns = self.fitted['scale']
+            df[columns] = scaler.transform(df[columns])
+            return df
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler  # sklearn yalnızca gerektiğinde
         scaler = MinMaxScaler() if scaler_type == 'minmax' else StandardScaler()
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        numeric_cols = list(df.select_dtypes(include=['number']).columns)
         df[numeric_cols] = scaler.fit_transform(df[numeric_cols])
+        self.fitted['scale'] = (scaler, numeric_cols)
         return df
 
     def add_indicators(self, df, indicators=None):
@@ -63,14 +131,37 @@ class DataProcessor(BaseDataProcessor):
             # Başka göstergeler kolayca eklenebilir
         return df
 
-    def add_lagged_features(self, df, columns=None, lags=1):
-        # Gecikmeli fiyatlar ve göstergeler
+    def add_feature_bank(self, df, windows=DEFAULT_WINDOWS, families=FEATURE_BANK_FAMILIES, column='close', macd_pairs=None):
+        """
+        Add every indicator family over a list of windows in one vectorized pass (see feature_bank.py).
+        Columns are named '<family>_<window>' (e.g. 'rsi_14', 'macd_12_26'); non-close columns get a '<column>_' prefix.
+        """
+        prefix = '' if column == 'close' else f'{column}_'
+        matrix, names = build_feature_bank(df[column].to_numpy(dtype=np.float64), windows=windows,
+                                           families=families, macd_pairs=macd_pairs, prefix=prefix)
+        bank = pd.DataFrame(matrix, index=df.index, columns=names)
+        logger.info(f"Feature bank: {len(names)} kolon eklendi ({column}).")
+        # Tek concat: kolon kolon ekleme yok, frame parçalanmaz
+        return pd.concat([df.drop(columns=[c for c in names if c in df.columns]), bank], axis=1)
+
+    def add_lagged_features(self, df, columns=None, lags=1, mode='columns'):
+        """
+        Gecikmeli fiyatlar ve göstergeler.
+        :param lags: int (1..lags) or an iterable of lags (e.g. range(1, 129)).
+        :param mode: 'columns' adds '<col>_lag<L>' columns with a single concat;
+                     'matrix' adds nothing and keeps a lazy strided LagMatrix in self.lag_matrix.
+        """
         if columns is None:
             columns = ['close']
-        for col in columns:
-            for lag in range(1, lags+1):
-                df[f'{col}_lag{lag}'] = df[col].shift(lag)
-        return df
+        lag_matrix = LagMatrix.from_frame(df, columns, lags)
+        if mode == 'matrix':
+            self.lag_matrix = lag_matrix
+            logger.info(f"Lag matrix: {lag_matrix.shape} (lazy, kopyasız görünüm).")
+            return df
+        if mode != 'columns':
+            raise ValueError(f"Unknown lag mode: {mode}")
+        return pd.concat([df.drop(columns=[c for c in lag_matrix.column_names if c in df.columns]),
+                          lag_matrix.to_frame(index=df.index)], axis=1)
 
     def _rsi(self, series, period=14):
         delta = series.diff()
@@ -98,6 +189,7 @@ class DataProcessor(BaseDataProcessor):
 #     'fillna': {'method': 'ffill'},
 #     'remove_outliers': {'z_thresh': 3},
 #     'add_indicators': {'indicators': ['rsi', 'ema', 'macd', 'volatility', 'momentum', 'rolling_mean']},
+#     'add_feature_bank': {'windows': [5, 10, 14, 20, 50], 'families': ['sma', 'ema', 'rsi', 'volatility', 'momentum', 'macd']},
 #     'add_lagged_features': {'columns': ['close', 'volume'], 'lags': 3},
 #     'scale': {'scaler_type': 'minmax'}
 # }
@@ -0,0 +1,279 @@
+import atexit
+import json
+import os
+import random
+import time
+import zlib
+from abc import ABC, abstractmethod
+
+import numpy as np
+from loguru import logger
+from src.utils.timeframes import timeframe_to_ms, bar_open
+
+EXCHANGE_MODES = ('live', 'record', 'replay')
+
+
+class ExchangeBackendError(Exception):
+    pass
+
+
+class BaseExchangeBackend(ABC):
+    """
+    Minimal exchange interface used by DataFetcher (ccxt-compatible signatures).
+    """
+    @abstractmethod
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        pass
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        """Raw trades as [timestamp_ms, price, amount] rows, oldest first (optional for backends)."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide trades")
+
+    def close(self):
+        """Release resources / persist buffered state (no-op by default)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CCXTBackend(BaseExchangeBackend):
+    """Live exchange through CCXT."""
+    def __init__(self, exchange_name):
+        import ccxt  # Ağır import: yalnızca canlı borsa gerektiğinde
+        try:
+            self.exchange = getattr(ccxt, exchange_name)()
+        except AttributeError:
+            raise ValueError(f"Exchange '{exchange_name}' is not supported by CCXT.")
+        self.name = exchange_name
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        trades = self.exchange.fetch_trades(symbol, since=since, limit=limit)
+        return [[t['timestamp'], t['price'], t['amount']] for t in trades]
+
+
+class RecordingBackend(BaseExchangeBackend):
+    """
+    Wraps another backend and records every fetch_ohlcv/fetch_trades response into a compact .npz cassette
+    (one float64 array per call: (n, 6) OHLCV or (n, 3) trades, plus a JSON index). Existing recordings are kept.
+    Responses are buffered in memory and the cassette is written once on flush()/close() (or at interpreter
+    exit), so recording N pages costs one write instead of N.
+    """
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._index, self._arrays = _load_cassette(path) if os.path.exists(path) else ([], [])
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        rows = self.inner.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        self._index.append({'symbol': symbol, 'timeframe': timeframe, 'since': since, 'limit': limit})
+        self._arrays.append(np.asarray(rows, dtype=np.float64).reshape(-1, 6))
+        self._dirty = True
+        return rows
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        rows = self.inner.fetch_trades(symbol, since=since, limit=limit)
+        self._index.append({'kind': 'trades', 'symbol': symbol, 'since': since, 'limit': limit})
+        self._arrays.append(np.asarray(rows, dtype=np.float64).reshape(-1, 3))
+        self._dirty = True
+        return rows
+
+    def flush(self):
+        """Write the cassette if there are unsaved responses."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        arrays = {f'r{i}': arr for i, arr in enumerate(self._arrays)}
+        np.savez_compressed(self.path, index=np.array(json.dumps(self._index)), **arrays)
+        self._dirty = False
+        logger.debug(f"Kayıt dosyası güncellendi: {self.path} ({len(self._index)} yanıt)")
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        if hasattr(self.inner, 'close'):
+            self.inner.close()
+
+
+class ReplayBackend(BaseExchangeBackend):
+    """
+    Serves recorded OHLCV from memory. All recordings for a symbol/timeframe are merged (deduplicated by
+    timestamp), so any since/limit inside the recorded range is answered like the exchange would:
+    bars with timestamp >= since, at most limit rows (latest `limit` bars when since is None).
+    Recorded trade pages are merged by page overlap (see _merge_trade_pages), never by row value.
+    Optional simulated latency and error injection make slow/unstable exchanges reproducible offline.
+    """
+    def __init__(self, path, latency=0.0, jitter=0.0, error_rate=0.0, fail_on=(), seed=None):
+        """
+        :param path: Cassette written by RecordingBackend.
+        :param latency: Seconds to sleep per call.
+        :param jitter: Uniform extra random latency in seconds (0..jitter).
+        :param error_rate: Probability that a call raises ExchangeBackendError.
+        :param fail_on: 1-based call numbers that always fail (deterministic error injection).
+        :param seed: Seed for jitter/error randomness.
+        """
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self._rng = random.Random(seed)
+        index, arrays = _load_cassette(path)
+        self._series, self._trades = {}, {}
+        for entry, arr in zip(index, arrays):
+            if entry.get('kind') == 'trades':
+                self._trades.setdefault(entry['symbol'], []).append(arr)
+            else:
+                self._series.setdefault((entry['symbol'], entry['timeframe']), []).append(arr)
+        for key, parts in self._series.items():
+            merged = np.concatenate(parts)
+            # Aynı timestamp için en son kaydedilen satır geçerli
+            _, last = np.unique(merged[::-1, 0], return_index=True)
+            self._series[key] = merged[::-1][last]
+        for key, parts in self._trades.items():
+            self._trades[key] = _merge_trade_pages(parts)
+        logger.info(f"Replay backend yüklendi: {path} ({len(self._series)} seri)")
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        self._simulate(f"{symbol} {timeframe}")
+        data = self._series.get((symbol, timeframe))
+        if data is None:
+            raise ExchangeBackendError(f"No recording for {symbol} {timeframe} in {self.path}")
+        return _window(data, since, limit)
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        self.calls += 1
+        self._simulate(f"{symbol} trades")
+        data = self._trades.get(symbol)
+        if data is None:
+            raise ExchangeBackendError(f"No trade recording for {symbol} in {self.path}")
+        return _window(data, since, limit)
+
+    def _simulate(self, what):
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.calls in self.fail_on or (self.error_rate and self._rng.random() < self.error_rate):
+            raise ExchangeBackendError(f"Injected error on call {self.calls} ({what})")
+
+
+class SyntheticExchangeBackend(BaseExchangeBackend):
+    """
+    Deterministic fake exchange: OHLCV is generated on the fly from the bar index, so any symbol/timeframe
+    and any since/limit is answered consistently. Bars are served up to now_fn() (ms) including the bar
+    that is still forming, like a real exchange. Intended for offline tests and simulated-clock runs.
+    """
+    def __init__(self, now_fn=None, base_price=30000.0, default_limit=500, trade_interval_ms=1000):
+        self.now_fn = now_fn or (lambda: time.time() * 1000)
+        self.base_price = base_price
+        self.default_limit = default_limit
+        self.trade_interval_ms = trade_interval_ms
+        self.calls = 0
+
+    def _close(self, k, seed):
+        # Sinüs tabanlı hash ile bar başına deterministik "gürültü"
+        noise = np.modf(np.abs(np.sin((k + seed) * 12.9898) * 43758.5453))[0] * 2 - 1
+        return self.base_price * (1 + 0.05 * np.sin((k + seed) / 50.0) + 0.004 * noise)
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        tf = timeframe_to_ms(timeframe)
+        offset = bar_open(0, timeframe) % tf  # haftalık barlar pazartesi açılır
+        limit = limit or self.default_limit
+        last = (int(self.now_fn()) - offset) // tf
+        first = last - limit + 1 if since is None else -(-(int(since) - offset) // tf)
+        k = np.arange(first, min(last, first + limit - 1) + 1, dtype=np.float64)
+        if k.size == 0:
+            return []
+        seed = zlib.crc32(symbol.encode()) % 10007
+        close, open_ = self._close(k, seed), self._close(k - 1, seed)
+        high = np.maximum(open_, close) * 1.001
+        low = np.minimum(open_, close) * 0.999
+        volume = 10 + 5 * np.abs(np.sin(k * 0.7 + seed))
+        return [[int(t) * tf + offset, o, h, l, c, v] for t, o, h, l, c, v
+                in zip(k, open_.tolist(), high.tolist(), low.tolist(), close.tolist(), volume.tolist())]
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        """Deterministic tape: one trade every trade_interval_ms, priced from the same curve as the bars."""
+        self.calls += 1
+        limit = limit or self.default_limit
+        step = self.trade_interval_ms
+        last = int(self.now_fn()) // step
+        first = last - limit + 1 if since is None else -(-int(since) // step)
+        k = np.arange(first, min(last, first + limit - 1) + 1, dtype=np.float64)
+        seed = zlib.crc32(symbol.encode()) % 10007
+        price = np.round(self._close(k * step / 60_000.0, seed), 2)
+        amount = 0.01 + np.abs(np.sin(k * 1.3 + seed))
+        return [[int(t) * step, p, a] for t, p, a in zip(k, price.tolist(), amount.tolist())]
+
+
+def _merge_trade_pages(pages):
+    """
+    Merge recorded trade pages without dropping identical fills. Pages only overlap by range (paging with
+    since/limit re-serves the boundary millisecond, a limit can cut a millisecond short), so every
+    millisecond is taken from the page holding the most trades at it; identical rows inside a page are
+    distinct trades and are kept.
+    """
+    merged = np.concatenate(pages)
+    page = np.repeat(np.arange(len(pages)), [len(p) for p in pages])
+    order = np.lexsort((page, merged[:, 0]))  # timestamp, sonra sayfa; sayfa içi sıra korunur
+    merged, page = merged[order], page[order]
+    ts = merged[:, 0]
+    # (timestamp, sayfa) grupları ve her grubun işlem sayısı
+    starts = np.flatnonzero(np.r_[True, (ts[1:] != ts[:-1]) | (page[1:] != page[:-1])])
+    counts = np.diff(np.r_[starts, len(ts)])
+    group_ts = ts[starts]
+    # Her milisaniye için en çok işlem içeren (eşitlikte ilk kaydedilen) sayfa
+    ms_starts = np.flatnonzero(np.r_[True, group_ts[1:] != group_ts[:-1]])
+    ms_id = np.repeat(np.arange(len(ms_starts)), np.diff(np.r_[ms_starts, len(starts)]))
+    candidates = np.flatnonzero(counts == np.maximum.reduceat(counts, ms_starts)[ms_id])
+    best = np.zeros(len(starts), dtype=bool)
+    best[candidates[np.r_[True, ms_id[candidates][1:] != ms_id[candidates][:-1]]]] = True
+    return merged[np.repeat(best, counts)]
+
+
+def _window(data, since, limit):
+    # Borsa davranışı: since verilirse ilk `limit` satır, verilmezse son `limit` satır
+    if since is not None:
+        data = data[np.searchsorted(data[:, 0], since):]
+        if limit:
+            data = data[:limit]
+    elif limit:
+        data = data[-limit:]
+    rows = data.tolist()
+    for row in rows:
+        row[0] = int(row[0])
+    return rows
+
+
+def create_backend(exchange_name, mode='live', path=None, **replay_kwargs):
+    """
+    Build an exchange backend.
+    :param mode: 'live' (ccxt), 'record' (ccxt + cassette at path) or 'replay' (cassette at path, offline).
+    """
+    if mode not in EXCHANGE_MODES:
+        raise ValueError(f"Unknown exchange mode: {mode}")
+    if mode != 'live' and not path:
+        raise ValueError(f"Exchange mode '{mode}' requires a cassette path")
+    if mode == 'replay':
+        return ReplayBackend(path, **replay_kwargs)
+    live = CCXTBackend(exchange_name)
+    return RecordingBackend(live, path) if mode == 'record' else live
+
+
+def _load_cassette(path):
+    with np.load(path) as data:
+        index = json.loads(str(data['index']))
+        arrays = [data[f'r{i}'] for i in range(len(index))]
+    return index, arrays
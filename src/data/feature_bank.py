@@ -0,0 +1,192 @@
+import numpy as np
+from scipy.signal import lfilter
+
+FEATURE_BANK_FAMILIES = ('sma', 'ema', 'rsi', 'volatility', 'momentum', 'macd')
+DEFAULT_WINDOWS = (5, 10, 14, 20, 26, 50, 100, 200)
+ROLLING_BLOCK = 4096
+
+
+def rolling_sums(values, windows):
+    """
+    Rolling sums of a series for many windows at once, from a single cumulative sum.
+    Windows that contain a NaN (or are not yet full) are NaN, like pandas' rolling().
+    :param values: 1D array-like of floats.
+    :param windows: Iterable of window lengths.
+    :return: Array of shape (len(values), len(windows)).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    w = np.asarray(_check_windows(windows), dtype=np.int64)
+    valid = np.isfinite(x)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(x) + 1)[:, None]
+    start = np.maximum(end - w[None, :], 0)
+    sums = csum[end] - csum[start]
+    full = (ccount[end] - ccount[start]) == w[None, :]
+    return np.where(full, sums, np.nan)
+
+
+def rolling_std(values, windows, block_size=ROLLING_BLOCK):
+    """
+    Rolling sample standard deviation (ddof=1) for many windows at once, like pandas' rolling().std().
+    Sums of squares are accumulated per block of block_size rows on block-centred values, so the
+    precision does not degrade with the length of the series.
+    :param values: 1D array-like of floats.
+    :param windows: Iterable of window lengths.
+    :return: Array of shape (len(values), len(windows)).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    windows = _check_windows(windows)
+    w = np.asarray(windows, dtype=np.float64)
+    out = np.full((len(x), len(windows)), np.nan)
+    if not len(x) or not windows:
+        return out
+    # Her blok, en uzun pencerenin geçmişiyle birlikte kendi ortalamasına göre merkezlenir
+    history = max(windows) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(x), block_size):
+            lo = max(start - history, 0)
+            seg = x[lo:start + block_size]
+            finite = seg[np.isfinite(seg)]
+            seg = seg - (finite.mean() if len(finite) else 0.0)
+            sums = rolling_sums(seg, windows)
+            var = (rolling_sums(seg * seg, windows) - sums * sums / w) / (w - 1)
+            out[start:start + block_size] = np.sqrt(np.maximum(var, 0.0))[start - lo:]
+    out[:, w <= 1] = np.nan
+    return out
+
+
+def ema_bank(values, spans):
+    """
+    EMA (adjust=False) for many spans, like pandas' ewm(span, adjust=False).mean().
+    Each run of consecutive observations is a single C-level IIR pass (lfilter). Leading NaNs stay NaN,
+    interior NaNs repeat the last EMA, and the first observation after a gap of k steps gets weight
+    alpha against (1 - alpha) ** k for the previous EMA, as in pandas. (pandas special-cases alpha == 0.5,
+    i.e. span 3, and weights that gap differently; without NaNs the values are identical.)
+    :param values: 1D array-like of floats.
+    :param spans: Iterable of EMA spans.
+    :return: Array of shape (len(values), len(spans)).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    spans = _check_windows(spans, 'spans')
+    out = np.full((len(x), len(spans)), np.nan)
+    finite = np.isfinite(x)
+    if not finite.any():
+        return out
+    # Kesintisiz gözlem dizileri: [start, end)
+    obs = np.flatnonzero(finite)
+    breaks = np.flatnonzero(np.diff(obs) > 1) + 1
+    starts = obs[np.r_[0, breaks]]
+    ends = obs[np.r_[breaks - 1, len(obs) - 1]] + 1
+    for j, span in enumerate(spans):
+        alpha = 2.0 / (span + 1.0)
+        prev = None
+        for start, end in zip(starts, ends):
+            if prev is None:
+                y0 = x[start]
+            else:
+                # Boşluk boyunca eski ağırlık (1 - alpha) ** k ile söner
+                old = (1.0 - alpha) ** (start - prev_end + 1)
+                y0 = (old * prev + alpha * x[start]) / (old + alpha)
+            out[start, j] = y0
+            if end - start > 1:
+                out[start + 1:end, j], _ = lfilter([alpha], [1.0, alpha - 1.0], x[start + 1:end],
+                                                   zi=[(1.0 - alpha) * y0])
+            prev, prev_end = out[end - 1, j], end
+    # Aradaki NaN'larda son EMA değeri korunur
+    first = obs[0]
+    idx = np.maximum.accumulate(np.where(finite, np.arange(len(x)), first))
+    out[first:] = out[idx[first:]]
+    return out
+
+
+def feature_bank_columns(windows=DEFAULT_WINDOWS, families=FEATURE_BANK_FAMILIES, macd_pairs=None, prefix=''):
+    """
+    Column names produced by build_feature_bank, in output order.
+    """
+    windows = _check_windows(windows)
+    names = []
+    for family in families:
+        if family == 'macd':
+            pairs = _macd_pairs(windows, macd_pairs)
+            names.extend(f'{prefix}macd_{fast}_{slow}' for fast, slow in pairs)
+        elif family in FEATURE_BANK_FAMILIES:
+            names.extend(f'{prefix}{family}_{w}' for w in windows)
+        else:
+            raise ValueError(f"Unknown feature bank family: {family}")
+    return names
+
+
+def build_feature_bank(values, windows=DEFAULT_WINDOWS, families=FEATURE_BANK_FAMILIES, macd_pairs=None, prefix=''):
+    """
+    Compute every indicator family over every window in one vectorized pass.
+    Rolling families share cumulative sums (volatility re-centres them per block); all EMAs (incl. MACD legs) are computed once per unique span.
+    Values match DataProcessor's single-window indicators (sma/rolling_mean, ema, rsi, volatility, momentum, macd).
+    :param values: 1D price series (e.g. close).
+    :param windows: Window lengths applied to each family.
+    :param families: Subset of FEATURE_BANK_FAMILIES.
+    :param macd_pairs: List of (fast, slow) spans. Default: every fast < slow pair from windows.
+    :param prefix: Optional column name prefix.
+    :return: (matrix, names) where matrix is a preallocated (n, n_features) float64 array.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    windows = _check_windows(windows)
+    families = list(families)
+    names = feature_bank_columns(windows, families, macd_pairs, prefix)
+    out = np.empty((len(x), len(names)), dtype=np.float64)
+    n_win = len(windows)
+    w = np.asarray(windows, dtype=np.float64)
+
+    # Tüm EMA'lar (ema + macd bacakları) tek seferde
+    pairs = _macd_pairs(windows, macd_pairs) if 'macd' in families else []
+    spans = sorted(set(windows if 'ema' in families else []) | {s for pair in pairs for s in pair})
+    emas = ema_bank(x, spans) if spans else None
+    span_idx = {s: i for i, s in enumerate(spans)}
+
+    sums = rolling_sums(x, windows) if 'sma' in families else None
+
+    col = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for family in families:
+            if family == 'sma':
+                out[:, col:col + n_win] = sums / w
+            elif family == 'ema':
+                out[:, col:col + n_win] = emas[:, [span_idx[s] for s in windows]]
+            elif family == 'volatility':
+                out[:, col:col + n_win] = rolling_std(x, windows)
+            elif family == 'momentum':
+                block = out[:, col:col + n_win]
+                block[:] = np.nan
+                for j, lag in enumerate(windows):
+                    if lag < len(x):
+                        block[lag:, j] = x[lag:] - x[:-lag]
+            elif family == 'rsi':
+                delta = np.diff(x, prepend=np.nan)
+                gain = rolling_sums(np.where(delta > 0, delta, 0.0), windows)
+                loss = rolling_sums(np.where(delta < 0, -delta, 0.0), windows)
+                out[:, col:col + n_win] = 100 - 100 / (1 + gain / loss)
+            elif family == 'macd':
+                fast_idx = [span_idx[f] for f, _ in pairs]
+                slow_idx = [span_idx[s] for _, s in pairs]
+                out[:, col:col + len(pairs)] = emas[:, fast_idx] - emas[:, slow_idx]
+                col += len(pairs)
+                continue
+            col += n_win
+    return out, names
+
+
+def _macd_pairs(windows, macd_pairs):
+    if macd_pairs is not None:
+        return [tuple(_check_windows(pair, 'macd_pairs')) for pair in macd_pairs]
+    uniq = sorted(set(windows))
+    return [(f, s) for i, f in enumerate(uniq) for s in uniq[i + 1:]]
+
+
+def _check_windows(windows, name='windows'):
+    checked = []
+    for w in windows:
+        if isinstance(w, (bool, np.bool_)) or not isinstance(w, (int, np.integer, float, np.floating)) \
+                or not np.isfinite(w) or w != int(w) or w < 1:
+            raise ValueError(f"{name} must be integers >= 1, got {w!r}")
+        checked.append(int(w))
+    return checked
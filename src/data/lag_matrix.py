@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class LagMatrix:
+    """
+    Lazy lag matrix over one or more base columns.
+    All lags are strided (zero-copy) views over a single NaN-padded copy of the base arrays;
+    memory does not grow with columns x lags until a contiguous array is requested.
+    Row t / lag L holds base[t - L] (NaN where t - L < 0), exactly like Series.shift(L).
+    """
+    def __init__(self, base, columns, lags=1):
+        """
+        :param base: 2D array (n_rows, n_columns) or 1D array of base values.
+        :param columns: Column names of base.
+        :param lags: int (1..lags), or an iterable of non-negative lags (e.g. range(1, 257)).
+        """
+        base = np.asarray(base, dtype=np.float64)
+        if base.ndim == 1:
+            base = base[:, None]
+        self.columns = list(columns)
+        if base.shape[1] != len(self.columns):
+            raise ValueError(f"base has {base.shape[1]} columns but {len(self.columns)} names were given")
+        self.lags = np.arange(1, lags + 1) if np.isscalar(lags) else np.asarray(list(lags), dtype=np.int64)
+        if self.lags.size == 0 or self.lags.min() < 0:
+            raise ValueError(f"lags must be non-negative and non-empty: {lags}")
+        self.n_rows = base.shape[0]
+        self.max_lag = int(self.lags.max())
+        # Tek kopya: başa max_lag kadar NaN satırı eklenmiş taban dizisi
+        self._padded = np.empty((self.n_rows + self.max_lag, base.shape[1]), dtype=np.float64)
+        self._padded[:self.max_lag] = np.nan
+        self._padded[self.max_lag:] = base
+        # windows[t, c, k] = padded[t + k, c]  ->  lag L = max_lag - k
+        self._windows = sliding_window_view(self._padded, self.max_lag + 1, axis=0)
+
+    @classmethod
+    def from_frame(cls, df, columns=None, lags=1):
+        columns = ['close'] if columns is None else list(columns)
+        return cls(df[columns].to_numpy(dtype=np.float64), columns, lags)
+
+    @property
+    def column_names(self):
+        """Flat column names, column-major: '<col>_lag<L>' for each column then each lag."""
+        return [f'{col}_lag{lag}' for col in self.columns for lag in self.lags]
+
+    @property
+    def shape(self):
+        return (self.n_rows, len(self.columns), len(self.lags))
+
+    def view(self):
+        """
+        (n_rows, n_columns, n_lags) array. Zero-copy when lags form an evenly spaced range,
+        otherwise a gather over the strided windows.
+        """
+        k = self.max_lag - self.lags
+        step = k[1] - k[0] if len(k) > 1 else 1
+        if step != 0 and np.array_equal(k, k[0] + step * np.arange(len(k))):
+            stop = k[-1] + step
+            return self._windows[:, :, k[0]:(stop if stop >= 0 else None):step]
+        return self._windows[:, :, k]
+
+    def lag(self, column, lag):
+        """Single lagged column as a view (no copy)."""
+        c = self.columns.index(column)
+        return self._padded[self.max_lag - lag:self.max_lag - lag + self.n_rows, c]
+
+    def to_array(self, dtype=np.float64):
+        """Contiguous (n_rows, n_columns * n_lags) matrix in column_names order."""
+        return np.ascontiguousarray(self.view().reshape(self.n_rows, -1), dtype=dtype)
+
+    def to_sequences(self, dtype=np.float64, oldest_first=True):
+        """
+        Contiguous (n_rows, n_lags, n_columns) tensor for sequence models.
+        :param oldest_first: Order the time axis from the largest lag to the smallest.
+        """
+        seq = self.view().transpose(0, 2, 1)
+        if oldest_first and len(self.lags) > 1 and self.lags[0] < self.lags[-1]:
+            seq = seq[:, ::-1]
+        return np.ascontiguousarray(seq, dtype=dtype)
+
+    def to_frame(self, index=None):
+        return pd.DataFrame(self.to_array(), index=index, columns=self.column_names)
+
+    def valid_rows(self):
+        """Boolean mask of rows whose lags are all available (no NaN from padding)."""
+        return np.arange(self.n_rows) >= self.max_lag
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# lm = LagMatrix.from_frame(df, columns=['close', 'volume'], lags=range(1, 129))
+# X_seq = lm.to_sequences()[lm.valid_rows()]  # (n, 128, 2) LSTM girdisi
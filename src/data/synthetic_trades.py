@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def generate_synthetic_trades(n, start_ms=1_700_000_000_000, start_price=30000.0, mean_interval_ms=50.0,
+                              volatility=2e-4, mean_amount=0.05, seed=None, rng=None):
+    """
+    Random trade tape for offline tests and benchmarks: exponential inter-arrival times (ms, sorted),
+    geometric random-walk prices rounded to 0.01 and log-normal amounts.
+    :return: (timestamp int64 ms, price float64, amount float64) arrays of length n.
+    """
+    rng = rng or np.random.default_rng(seed)
+    ts = start_ms + np.cumsum(rng.exponential(mean_interval_ms, n)).astype(np.int64)
+    price = np.round(start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n))), 2)
+    amount = rng.lognormal(np.log(mean_amount), 1.0, n)
+    return ts, price, amount
+
+
+def iter_synthetic_trades(n_total, chunk_size=1_000_000, seed=None, **kwargs):
+    """
+    Yield a continuous synthetic tape in chunks (bounded memory), e.g. tens of millions of trades.
+    Same keyword arguments as generate_synthetic_trades.
+    """
+    rng = np.random.default_rng(seed)
+    start_ms = kwargs.pop('start_ms', 1_700_000_000_000)
+    start_price = kwargs.pop('start_price', 30000.0)
+    for offset in range(0, n_total, chunk_size):
+        ts, price, amount = generate_synthetic_trades(min(chunk_size, n_total - offset), start_ms=start_ms,
+                                                      start_price=start_price, rng=rng, **kwargs)
+        # Bir sonraki parça kaldığı yerden devam eder
+        start_ms, start_price = int(ts[-1]), float(price[-1])
+        yield ts, price, amount
@@ -0,0 +1,97 @@
+import glob
+import os
+
+import numpy as np
+from loguru import logger
+
+
+class TradeStore:
+    """
+    Local append-only trade store: one .npz chunk per write (timestamp int64 ms, price, amount float64).
+    Chunk files are named by their first/last timestamp, so reads are ordered and can skip chunks
+    outside a time range; iter_chunks keeps memory bounded to one chunk.
+    Default location follows main.py's layout: data/<exchange>/<symbol>/trades/.
+    """
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def for_symbol(cls, exchange_name, symbol, base_dir='data'):
+        return cls(os.path.join(base_dir, exchange_name, symbol.replace('/', '_'), 'trades'))
+
+    def _chunks(self):
+        return sorted(glob.glob(os.path.join(self.root, 'trades_*.npz')))
+
+    @staticmethod
+    def _range(path):
+        parts = os.path.basename(path)[len('trades_'):-len('.npz')].split('_')
+        return int(parts[0]), int(parts[1])
+
+    def append(self, timestamps, prices, amounts):
+        """
+        Write one chunk. Timestamps must be sorted and not earlier than the last stored trade (the store is
+        append-only, so chunks never overlap); trades in the last stored millisecond may continue.
+        :raises ValueError: On unsorted or earlier timestamps.
+        """
+        ts = np.asarray(timestamps, dtype=np.int64)
+        if ts.size == 0:
+            return None
+        if np.any(ts[1:] < ts[:-1]):
+            raise ValueError("Trade timestamps must be sorted")
+        last = self.last_timestamp()
+        if last is not None and ts[0] < last:
+            raise ValueError(f"Trades from {ts[0]} are earlier than the last stored trade ({last}) in {self.root}")
+        base = os.path.join(self.root, f'trades_{ts[0]:015d}_{ts[-1]:015d}')
+        path, n = base + '.npz', 0
+        while os.path.exists(path):
+            # Aynı milisaniyeye ikinci parça: sıralı kalacak şekilde numaralandır
+            n += 1
+            path = f'{base}_{n:06d}.npz'
+        np.savez(path, timestamp=ts, price=np.asarray(prices, dtype=np.float64),
+                 amount=np.asarray(amounts, dtype=np.float64))
+        return path
+
+    def last_timestamp(self):
+        chunks = self._chunks()
+        return self._range(chunks[-1])[1] if chunks else None
+
+    def boundary(self):
+        """(last timestamp, number of stored trades at that millisecond), or (None, 0) when empty."""
+        last, count = None, 0
+        for path in reversed(self._chunks()):
+            first, end = self._range(path)
+            last = end if last is None else last
+            if end != last:
+                break
+            with np.load(path) as data:
+                count += int(np.count_nonzero(data['timestamp'] == last))
+            if first != last:
+                break
+        return last, count
+
+    def iter_chunks(self, since=None, until=None):
+        """Yield (timestamp, price, amount) arrays chunk by chunk, filtered to since <= ts < until."""
+        for path in self._chunks():
+            first, last = self._range(path)
+            if (since is not None and last < since) or (until is not None and first >= until):
+                continue
+            with np.load(path) as data:
+                ts, price, amount = data['timestamp'], data['price'], data['amount']
+            mask = np.ones(len(ts), dtype=bool)
+            if since is not None:
+                mask &= ts >= since
+            if until is not None:
+                mask &= ts < until
+            if not mask.all():
+                ts, price, amount = ts[mask], price[mask], amount[mask]
+            if len(ts):
+                yield ts, price, amount
+
+    def __len__(self):
+        return sum(len(ts) for ts, _, _ in self.iter_chunks())
+
+    def clear(self):
+        for path in self._chunks():
+            os.remove(path)
+        logger.info(f"Trade store temizlendi: {self.root}")
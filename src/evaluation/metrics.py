@@ -1,16 +1,17 @@
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, confusion_matrix, classification_report
+import numpy as np
 import pandas as pd
 from loguru import logger
+from .streaming_metrics import confusion_from_codes, scores_from_confusion
 
 def classification_metrics(y_true, y_pred, output_path=None, run_id=None, model_name=None):
-    metrics = {
-        'accuracy': accuracy_score(y_true, y_pred),
-        'f1': f1_score(y_true, y_pred, average='macro'),
-        'precision': precision_score(y_true, y_pred, average='macro'),
-        'recall': recall_score(y_true, y_pred, average='macro'),
-        'confusion_matrix': confusion_matrix(y_true, y_pred).tolist(),
-        'report': classification_report(y_true, y_pred, output_dict=True)
-    }
+    # Tek geçiş: tüm skorlar ve rapor aynı confusion matrix'ten türetilir
+    y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"y_true and y_pred have different lengths: {len(y_true)} != {len(y_pred)}")
+    labels, codes = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+    codes = codes[:len(y_true)] * len(labels) + codes[len(y_true):]
+    scores = scores_from_confusion(confusion_from_codes(codes, len(labels)), labels)
+    metrics = {k: scores[k] for k in ['accuracy', 'f1', 'precision', 'recall', 'confusion_matrix', 'report']}
     logger.info(f"Evaluation metrics: {metrics}")
     if output_path and model_name and run_id:
         df = pd.DataFrame([metrics])
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from loguru import logger
+
+MC_METHODS = ('block_bootstrap', 'random_signal')
+MC_STATS = ('total_return', 'sharpe', 'max_drawdown')
+SEED_BLOCK = 25  # path sayısı / tohum; chunk'lar bu katlara yuvarlanır
+
+
+def path_statistics(returns, periods_per_year=None):
+    """
+    Total return, Sharpe and max drawdown for every path (last axis is time).
+    Max drawdown is <= 0, so for all three statistics larger is better.
+    :param returns: (n_paths, n_bars) or (n_bars,) per-bar simple returns.
+    :param periods_per_year: Annualize Sharpe with sqrt(periods_per_year) (optional, e.g. 8760 for 1h).
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    equity = np.cumprod(1.0 + r, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_drawdown = (equity / peak - 1.0).min(axis=1)
+    std = r.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, r.mean(axis=1) / std, 0.0)
+    if periods_per_year:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+    return {'total_return': equity[:, -1] - 1.0, 'sharpe': sharpe, 'max_drawdown': max_drawdown}
+
+
+def block_bootstrap_indices(n, n_paths, block_size, rng):
+    """Circular moving-block bootstrap indices, shape (n_paths, n)."""
+    block_size = max(1, min(int(block_size), n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    return idx.reshape(n_paths, -1)[:, :n]
+
+
+def _run_chunk(seed_seqs, sizes, strategy, market, signals, method, block_size, periods_per_year):
+    boot, null = [], []
+    # Her tohum bloğu kendi RNG'sini kullanır: sonuçlar chunk_size'dan bağımsız
+    for seed_seq, n_paths in zip(seed_seqs, sizes):
+        rng = np.random.default_rng(seed_seq)
+        block = strategy[block_bootstrap_indices(len(strategy), n_paths, block_size, rng)]
+        boot.append(block)
+        if method == 'block_bootstrap':
+            # Null hipotezi: sıfır ortalamalı getiri (aynı bloklar, ortalaması çıkarılmış seri)
+            null.append(block - strategy.mean())
+        else:
+            # Null hipotezi: aynı sinyal dağılımı, rastgele zamanlama
+            null.append(rng.permuted(np.broadcast_to(signals, (n_paths, len(signals))), axis=1) * market)
+    boot_stats = path_statistics(np.concatenate(boot), periods_per_year)
+    del boot
+    null_stats = path_statistics(np.concatenate(null), periods_per_year)
+    return boot_stats, null_stats
+
+
+def monte_carlo_test(strategy_returns, market_returns=None, signals=None, method='block_bootstrap',
+                     n_paths=10000, block_size=24, chunk_size=250, n_jobs=-1, seed=None,
+                     confidence=0.95, periods_per_year=None):
+    """
+    Monte Carlo significance test for a backtest.
+    Confidence intervals come from a block bootstrap of the strategy returns; p-values compare the
+    observed statistic with a null distribution ('block_bootstrap': zero-mean resampled returns,
+    'random_signal': randomly permuted signals applied to the market returns).
+    Paths are generated in chunks of chunk_size (bounded memory, rounded to a multiple of SEED_BLOCK) and
+    chunks run in parallel threads. Every block of SEED_BLOCK paths has its own seed, so results are
+    reproducible for a given seed regardless of n_jobs and chunk_size.
+    :return: dict with 'observed', 'ci', 'p_value' (per statistic), 'null_mean', 'n_paths', 'method'.
+    """
+    if method not in MC_METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+    strategy = np.asarray(strategy_returns, dtype=np.float64)
+    if method == 'random_signal':
+        if market_returns is None or signals is None:
+            raise ValueError("random_signal method requires market_returns and signals")
+        market = np.asarray(market_returns, dtype=np.float64)
+        signals = np.asarray(signals, dtype=np.float64)
+        if not (len(market) == len(signals) == len(strategy)):
+            raise ValueError("strategy_returns, market_returns and signals must have the same length")
+    else:
+        market = None
+    if len(strategy) < 2:
+        raise ValueError("At least two returns are required")
+
+    sizes = [min(SEED_BLOCK, n_paths - start) for start in range(0, n_paths, SEED_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    per_chunk = max(1, int(chunk_size) // SEED_BLOCK)
+    chunks = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(_run_chunk)(seeds[i:i + per_chunk], sizes[i:i + per_chunk], strategy, market, signals,
+                            method, block_size, periods_per_year)
+        for i in range(0, len(sizes), per_chunk)
+    )
+    observed = {k: float(v[0]) for k, v in path_statistics(strategy, periods_per_year).items()}
+    alpha = (1.0 - confidence) / 2.0
+    result = {'method': method, 'n_paths': n_paths, 'confidence': confidence,
+              'observed': observed, 'ci': {}, 'p_value': {}, 'null_mean': {}}
+    for stat in MC_STATS:
+        boot = np.concatenate([c[0][stat] for c in chunks])
+        null = np.concatenate([c[1][stat] for c in chunks])
+        result['ci'][stat] = (float(np.quantile(boot, alpha)), float(np.quantile(boot, 1.0 - alpha)))
+        # Tek yönlü: null dağılımında gözlenen kadar iyi (veya daha iyi) sonuç oranı
+        result['p_value'][stat] = float((1 + np.count_nonzero(null >= observed[stat])) / (n_paths + 1))
+        result['null_mean'][stat] = float(null.mean())
+    logger.info(f"Monte Carlo ({method}, {n_paths} path): p-değerleri {result['p_value']}")
+    return result
+
+
+def backtest_monte_carlo(backtest_df, signal_col='shifted_signal', return_col='return',
+                         strategy_col='strategy_return', **kwargs):
+    """
+    Run monte_carlo_test on a simple_backtest() output (rows with missing values are dropped).
+    """
+    df = backtest_df[[strategy_col, return_col, signal_col]].dropna()
+    return monte_carlo_test(df[strategy_col].values, market_returns=df[return_col].values,
+                            signals=df[signal_col].values, **kwargs)
+
+
+def monte_carlo_report(result):
+    """Flatten a monte_carlo_test result into a DataFrame (one row per statistic)."""
+    rows = []
+    for stat in MC_STATS:
+        lo, hi = result['ci'][stat]
+        rows.append({'statistic': stat, 'observed': result['observed'][stat], 'ci_low': lo, 'ci_high': hi,
+                     'null_mean': result['null_mean'][stat], 'p_value': result['p_value'][stat]})
+    return pd.DataFrame(rows).set_index('statistic')
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# result = backtest_monte_carlo(backtest_df, method='random_signal', n_paths=10000, seed=42, periods_per_year=8760)
+# print(monte_carlo_report(result))
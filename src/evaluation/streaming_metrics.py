@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+def confusion_from_codes(codes, n_labels):
+    """Confusion matrix from encoded pairs (true_idx * n_labels + pred_idx) with one bincount."""
+    return np.bincount(codes, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+
+def scores_from_confusion(cm, labels=None):
+    """
+    Accuracy and macro precision/recall/f1 derived from a confusion matrix (rows: true, cols: predicted).
+    Like sklearn, the macro average only covers labels present in y_true or y_pred, and 0/0 counts as 0.
+    :param labels: Optional label values; when given a per-class report (sklearn output_dict layout) is added.
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    tp = np.diag(cm).astype(np.float64)
+    true_sum = cm.sum(axis=1).astype(np.float64)
+    pred_sum = cm.sum(axis=0).astype(np.float64)
+    total = cm.sum()
+    present = (true_sum + pred_sum) > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(pred_sum > 0, tp / pred_sum, 0.0)
+        recall = np.where(true_sum > 0, tp / true_sum, 0.0)
+        f1 = np.where(true_sum + pred_sum > 0, 2 * tp / (true_sum + pred_sum), 0.0)
+
+    def _avg(values, weights=None):
+        if not present.any():
+            return 0.0
+        return float(np.average(values[present], weights=None if weights is None else weights[present]))
+
+    scores = {
+        'accuracy': float(tp.sum() / total) if total else 0.0,
+        'f1': _avg(f1),
+        'precision': _avg(precision),
+        'recall': _avg(recall),
+        'confusion_matrix': cm[np.ix_(present, present)].tolist(),
+        'n': int(total),
+    }
+    if labels is not None:
+        report = {}
+        for i, label in enumerate(labels):
+            if present[i]:
+                report[str(label)] = {'precision': float(precision[i]), 'recall': float(recall[i]),
+                                      'f1-score': float(f1[i]), 'support': int(true_sum[i])}
+        report['accuracy'] = scores['accuracy']
+        support = int(true_sum[present].sum())
+        report['macro avg'] = {'precision': scores['precision'], 'recall': scores['recall'],
+                               'f1-score': scores['f1'], 'support': support}
+        weights = true_sum if support else None
+        report['weighted avg'] = {'precision': _avg(precision, weights), 'recall': _avg(recall, weights),
+                                  'f1-score': _avg(f1, weights), 'support': support}
+        scores['report'] = report
+    return scores
+
+
+class StreamingClassificationMetrics:
+    """
+    Incremental classification metrics for live signals.
+    Keeps a cumulative confusion matrix, an optional rolling window (last N bars) and optional
+    per-period confusion matrices; every score is derived from those matrices, so an update costs
+    one bincount over the new batch instead of recomputing over the whole history.
+    """
+    def __init__(self, labels=(-1, 0, 1), window=None, period=None):
+        """
+        :param labels: All possible label values (e.g. (-1, 0, 1) or (0, 1)).
+        :param window: Rolling window length in bars (optional).
+        :param period: Pandas period alias for breakdowns, e.g. 'D', 'W', 'M' (optional, needs timestamps).
+        """
+        self.labels = np.sort(np.asarray(labels))
+        self.n_labels = len(self.labels)
+        self.window = window
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.confusion = np.zeros((self.n_labels, self.n_labels), dtype=np.int64)
+        self.window_confusion = np.zeros_like(self.confusion)
+        self.period_confusion = {}
+        if self.window:
+            self._ring = np.zeros(self.window, dtype=np.int64)
+            self._head = 0
+            self._filled = 0
+
+    def _encode(self, values):
+        values = np.asarray(values).ravel()
+        idx = np.searchsorted(self.labels, values)
+        idx = np.clip(idx, 0, self.n_labels - 1)
+        if not np.array_equal(self.labels[idx], values):
+            unknown = np.setdiff1d(values, self.labels)
+            raise ValueError(f"Unknown labels {unknown.tolist()}; expected {self.labels.tolist()}")
+        return idx
+
+    def update(self, y_true, y_pred, timestamps=None):
+        """
+        Add a batch (or a single bar) of true/predicted signals.
+        :param timestamps: Datetime-like per row; required when period is set.
+        """
+        # Önce doğrulama: hata durumunda hiçbir sayaç değişmemeli
+        true_idx, pred_idx = self._encode(y_true), self._encode(y_pred)
+        if len(true_idx) != len(pred_idx):
+            raise ValueError(f"y_true and y_pred have different lengths: {len(true_idx)} != {len(pred_idx)}")
+        if self.period and len(true_idx):
+            if timestamps is None:
+                raise ValueError("timestamps are required for per-period metrics")
+            periods = self._periods(timestamps)
+            if len(periods) != len(true_idx):
+                raise ValueError(f"timestamps length {len(periods)} does not match batch length {len(true_idx)}")
+        codes = true_idx * self.n_labels + pred_idx
+        if codes.size == 0:
+            return self
+        self.confusion += confusion_from_codes(codes, self.n_labels)
+        if self.window:
+            self._update_window(codes)
+        if self.period:
+            self._update_periods(codes, periods)
+        return self
+
+    def _update_window(self, codes):
+        n = self.window
+        if len(codes) >= n:
+            self._ring[:] = codes[-n:]
+            self._head, self._filled = 0, n
+            self.window_confusion = confusion_from_codes(self._ring, self.n_labels)
+            return
+        pos = (self._head + np.arange(len(codes))) % n
+        # İlk (n - filled) slot boş; geri kalanı en eski kayıtların üzerine yazar
+        evicted = self._ring[pos[n - self._filled:]]
+        if evicted.size:
+            self.window_confusion -= confusion_from_codes(evicted, self.n_labels)
+        self._ring[pos] = codes
+        self.window_confusion += confusion_from_codes(codes, self.n_labels)
+        self._head = (self._head + len(codes)) % n
+        self._filled = min(n, self._filled + len(codes))
+
+    def _periods(self, timestamps):
+        return pd.DatetimeIndex(pd.to_datetime(np.asarray(timestamps).ravel())).to_period(self.period)
+
+    def _update_periods(self, codes, periods):
+        groups, keys = pd.factorize(periods, sort=True)
+        size = self.n_labels * self.n_labels
+        counts = np.bincount(groups * size + codes, minlength=len(keys) * size)
+        for key, cm in zip(keys.astype(str), counts.reshape(len(keys), self.n_labels, self.n_labels)):
+            if key in self.period_confusion:
+                self.period_confusion[key] += cm
+            else:
+                self.period_confusion[key] = cm
+
+    def compute(self, report=False):
+        """Cumulative scores (same keys as classification_metrics)."""
+        return scores_from_confusion(self.confusion, self.labels if report else None)
+
+    def compute_window(self):
+        """Scores over the last `window` bars."""
+        if not self.window:
+            raise ValueError("window is not configured")
+        return scores_from_confusion(self.window_confusion)
+
+    def period_metrics(self):
+        """DataFrame of scores per period (index: period)."""
+        rows = []
+        for key in sorted(self.period_confusion):
+            scores = scores_from_confusion(self.period_confusion[key])
+            scores.pop('confusion_matrix')
+            rows.append({'period': key, **scores})
+        return pd.DataFrame(rows, columns=['period', 'accuracy', 'f1', 'precision', 'recall', 'n']).set_index('period')
+
+    def log(self):
+        msg = f"Streaming metrics (cumulative): {self.compute()}"
+        if self.window:
+            msg += f" | son {self.window} bar: {self.compute_window()}"
+        logger.info(msg)
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# stream = StreamingClassificationMetrics(labels=(-1, 0, 1), window=500, period='D')
+# stream.update(true_batch, pred_batch, timestamps=ts_batch)
+# stream.compute_window()['f1']  # model bozulması (decay) takibi
+# stream.period_metrics()
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+class FlatForestPredictor:
+    """
+    Fitted sklearn forest compiled into flat node arrays (feature, threshold, children, leaf values).
+    All trees are traversed together with vectorized NumPy steps (one step per tree level),
+    which avoids sklearn's per-call validation and joblib dispatch for single rows and small batches.
+    Predictions are identical to the source forest's predict/predict_proba: NaN features follow the
+    per-node missing-value direction learned by sklearn, and DataFrame columns are matched by name.
+    """
+    def __init__(self, forest):
+        """
+        :param forest: Fitted RandomForestClassifier or RandomForestRegressor (single output).
+        """
+        if not hasattr(forest, 'estimators_'):
+            raise ValueError("Forest must be fitted before compiling.")
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Multi-output forests are not supported.")
+        self.is_classifier = hasattr(forest, 'classes_')
+        self.classes_ = forest.classes_ if self.is_classifier else None
+        self.n_features_in_ = forest.n_features_in_
+        names = getattr(forest, 'feature_names_in_', None)
+        self.feature_names_in_ = None if names is None else list(names)
+        self.n_trees = len(forest.estimators_)
+
+        features, thresholds, lefts, rights, values, roots, missing_left = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for est in forest.estimators_:
+            tree = est.tree_
+            left = tree.children_left.astype(np.intp)
+            right = tree.children_right.astype(np.intp)
+            leaf = left == -1
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            # Yapraklar kendilerine döner: sabit sayıda adımda tüm ağaçlar yaprakta durur
+            lefts.append(np.where(leaf, node_ids, left) + offset)
+            rights.append(np.where(leaf, node_ids, right) + offset)
+            features.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(tree.threshold.astype(np.float64))
+            # Eksik değer yönü (sklearn >= 1.3); yoksa NaN karşılaştırması gibi sağa gider
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(tree.node_count, dtype=bool) if missing is None else np.asarray(missing, dtype=bool))
+            value = tree.value[:, 0, :].astype(np.float64)
+            if self.is_classifier:
+                # sklearn Tree.predict_proba ile aynı normalizasyon
+                norm = value.sum(axis=1, keepdims=True)
+                norm[norm == 0.0] = 1.0
+                value = value / norm
+            values.append(value)
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max_depth
+
+    def _as_array(self, X):
+        if self.feature_names_in_ is not None and hasattr(X, 'columns'):
+            columns = [str(c) for c in X.columns]
+            if sorted(columns) != sorted(self.feature_names_in_):
+                raise ValueError(f"Feature names {columns} do not match the fitted features {self.feature_names_in_}.")
+            # Eğitimdeki kolon sırası
+            X = X[self.feature_names_in_]
+        # sklearn ağaçları float32 girdi ile karşılaştırır; birebir sonuç için aynı dönüşüm
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features_in_}.")
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+        return X
+
+    def _leaves(self, X):
+        X = self._as_array(X)
+        has_nan = np.isnan(X).any()
+        rows = np.arange(X.shape[0], dtype=np.intp)[None, :]
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node  # (n_trees, n_rows)
+
+    def predict_proba(self, X):
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers.")
+        # Ağaç sırasıyla toplayıp ağaç sayısına böl (sklearn ile aynı sıra)
+        return self.value[self._leaves(X)].sum(axis=0) / self.n_trees
+
+    def predict(self, X):
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+        return self.value[self._leaves(X), 0].sum(axis=0) / self.n_trees
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# flat = FlatForestPredictor(model.model)
+# signal = flat.predict(last_row_features)  # tek bar için
@@ -4,11 +4,21 @@ import json
 import os
 from datetime import datetime
 from .base_model import BaseModel
+from .flat_forest import FlatForestPredictor
+
+PREDICT_BACKENDS = ('sklearn', 'flat')
 
 class RandomForestModel(BaseModel):
-    def __init__(self, task='classification', **params):
+    def __init__(self, task='classification', predict_backend='sklearn', **params):
+        """
+        :param predict_backend: 'sklearn' or 'flat' (compiled FlatForestPredictor, low latency for single bars).
+        """
+        if predict_backend not in PREDICT_BACKENDS:
+            raise ValueError(f"Unknown predict backend: {predict_backend}")
         self.task = task
+        self.predict_backend = predict_backend
         self.params = params
+        self._flat = None
         if task == 'classification':
             self.model = RandomForestClassifier(**params)
         else:
@@ -16,9 +26,21 @@ class RandomForestModel(BaseModel):
 
     def fit(self, X, y):
         self.model.fit(X, y)
+        self._flat = None
         return self
 
-    def predict(self, X):
+    def compile(self):
+        """Fitted ormanı düz dizilere derler (flat backend için). Tekrar çağrılırsa yeniden derler."""
+        self._flat = FlatForestPredictor(self.model)
+        return self._flat
+
+    def predict(self, X, backend=None):
+        backend = backend or self.predict_backend
+        if backend not in PREDICT_BACKENDS:
+            raise ValueError(f"Unknown predict backend: {backend}")
+        if backend == 'flat':
+            flat = self._flat or self.compile()
+            return flat.predict(X)
         return self.model.predict(X)
 
     def save(self, path, metrics=None):
@@ -30,6 +52,7 @@ class RandomForestModel(BaseModel):
         meta = {
             'params': self.params,
             'task': self.task,
+            'predict_backend': self.predict_backend,
             'saved_at': datetime.now().isoformat()
         }
         if metrics is not None:
@@ -40,4 +63,5 @@ class RandomForestModel(BaseModel):
 
     def load(self, path):
         self.model = joblib.load(path)
+        self._flat = None
         return self
@@ -1,7 +1,9 @@
 import logging
 import os
+import time
 import pandas as pd
 from src.data.data_fetcher import DataFetcher
+from src.data.exchange_backends import create_backend
 from src.data.data_processor import DataProcessor
 from src.data.label_generator import PriceDirectionLabelGenerator
 from src.pipelines.splitter import TimeSeriesSplitter
@@ -9,23 +11,31 @@ from src.models.model_factory import get_model
 from src.pipelines.signal_writer import TimeSeriesSignalWriter
 from src.evaluation.metrics import classification_metrics
 from src.evaluation.backtest import simple_backtest
+from src.pipelines.run_catalog import RunCatalog, backtest_summary, DEFAULT_CATALOG_PATH
 from datetime import datetime
 
-# Log dosyası ayarları
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    filename='logs/pipeline.log',
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(message)s'
-)
+def setup_logging(log_dir='logs'):
+    # Log dosyası ayarları (import sırasında değil, çalıştırmada yapılır)
+    os.makedirs(log_dir, exist_ok=True)
+    logging.basicConfig(
+        filename=os.path.join(log_dir, 'pipeline.log'),
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
 
 
 def run_full_pipeline(config):
+    setup_logging(config.get('log_dir', 'logs'))
+    # Aşama süreleri (saniye) run kataloğuna yazılır
+    timings = {}
+    t_start = t0 = time.perf_counter()
     try:
         logging.info('Veri çekiliyor...')
-        fetcher = DataFetcher(config['exchange'])
-        df = fetcher.fetch_data(config['symbol'], config['timeframe'], config['limit'], since=config.get('since'))
+        with create_backend(config['exchange'], config.get('exchange_mode', 'live'), config.get('exchange_cassette')) as backend:
+            fetcher = DataFetcher(config['exchange'], backend=backend)
+            df = fetcher.fetch_data(config['symbol'], config['timeframe'], config['limit'], since=config.get('since'))
         logging.info(f'Veri çekildi: {df.shape}')
+        timings['fetch'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Veri çekme hatası: {e}')
         return
@@ -35,6 +45,7 @@ def run_full_pipeline(config):
         processor = DataProcessor(config['process_steps'])
         df_processed = processor.process(df, config['process_params'])
         logging.info(f'İşlenen veri: {df_processed.shape}')
+        timings['process'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Veri işleme hatası: {e}')
         return
@@ -51,6 +62,7 @@ def run_full_pipeline(config):
             direction_type=config.get('label_direction_type', 'multiclass')
         )
         logging.info('Label üretildi.')
+        timings['label'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Label/sinyal üretim hatası: {e}')
         return
@@ -69,6 +81,7 @@ def run_full_pipeline(config):
         X_test = drop_datetime_columns(X_test)
 
         logging.info(f'Train: {X_train.shape}, Test: {X_test.shape}')
+        timings['split'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Split hatası: {e}')
         return
@@ -78,6 +91,7 @@ def run_full_pipeline(config):
         model = get_model(config['model_name'], task='classification', **config['model_params'])
         model.fit(X_train, y_train)
         logging.info('Model eğitildi.')
+        timings['train'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Model eğitimi hatası: {e}')
         return
@@ -96,6 +110,7 @@ def run_full_pipeline(config):
         signal_path = os.path.join(output_dir, 'signals.csv')
         signal_df.to_csv(signal_path, index=False)
         logging.info(f'Sinyaller kaydedildi: {signal_path}')
+        timings['predict'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Sinyal kaydı hatası: {e}')
         return
@@ -112,6 +127,7 @@ def run_full_pipeline(config):
         backtest_path = os.path.join(output_dir, 'backtest.csv')
         backtest_result.to_csv(backtest_path, index=False)
         logging.info(f'Metrikler ve backtest kaydedildi: {metrics_path}, {backtest_path}')
+        timings['evaluate'], t0 = time.perf_counter() - t0, time.perf_counter()
     except Exception as e:
         logging.error(f'Değerlendirme/backtest hatası: {e}')
         return
@@ -120,16 +136,34 @@ def run_full_pipeline(config):
         # Model ve metadata kaydı
         model_path = os.path.join(output_dir, 'model.pkl')
         model.save(model_path, metrics=metrics_simple)
+        # Fit edilmiş işleme durumu (scaler): canlı döngü aynı ölçeği kullanır
+        processor.save_state(os.path.join(output_dir, 'processor.pkl'))
         logging.info(f'Model ve metadata kaydedildi: {model_path}')
+        timings['save'] = time.perf_counter() - t0
     except Exception as e:
         logging.error(f'Model kaydı hatası: {e}')
         return
 
+    try:
+        # Run kataloğu (SQLite indeks) kaydı
+        timings['total'] = time.perf_counter() - t_start
+        if config.get('catalog', True):
+            catalog = RunCatalog(config.get('catalog_path', DEFAULT_CATALOG_PATH))
+            catalog.record_run(output_dir, model_name=config['model_name'], run_id=run_id, config=config,
+                               metrics=metrics_simple, backtest=backtest_summary(backtest_result), timings=timings,
+                               n_train=len(X_train), n_test=len(X_test))
+            logging.info(f'Run kataloğa eklendi: {catalog.db_path}')
+    except Exception as e:
+        logging.error(f'Run kataloğu hatası: {e}')
+    return output_dir
+
 
 if __name__ == '__main__':
     # Örnek config, ileride yaml/json'dan okunabilir
     config = {
         'exchange': 'binance',
+        'exchange_mode': 'live',  # 'record' / 'replay' ile exchange_cassette dosyası kullanılır
+        'exchange_cassette': None,
         'symbol': 'BTC/USDT',
         'timeframe': '1h',
         'limit': 1000,
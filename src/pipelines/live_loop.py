@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.data.data_processor import DataProcessor
+from src.pipelines.signal_writer import TimeSeriesSignalWriter
+from src.utils.timeframes import timeframe_to_ms, next_bar_close
+
+
+class SystemClock:
+    """Wall clock (ms)."""
+    def now_ms(self):
+        return time.time() * 1000
+
+    async def sleep_until(self, ts_ms):
+        delay = (ts_ms - self.now_ms()) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SimulatedClock:
+    """
+    Simulated clock for offline runs: sleep_until jumps straight to the wake-up time, and between jumps
+    time advances at wall speed, so measured latencies still reflect the real processing time.
+    """
+    def __init__(self, start_ms):
+        self._base = float(start_ms)
+        self._t0 = time.perf_counter()
+
+    def now_ms(self):
+        return self._base + (time.perf_counter() - self._t0) * 1000
+
+    async def sleep_until(self, ts_ms):
+        self._base = max(self.now_ms(), float(ts_ms))
+        self._t0 = time.perf_counter()
+        await asyncio.sleep(0)
+
+
+def _to_ms(timestamps):
+    return pd.to_datetime(timestamps).dt.as_unit('ms').astype('int64')
+
+
+class LiveSignalLoop:
+    """
+    Bar-close aligned live signal loop.
+    A single asyncio scheduler wakes at every bar close of the configured (symbol, timeframe) streams.
+    Due streams are processed concurrently: only the new closed bars are fetched (fetch_latest),
+    features are recomputed over a bounded warmup window, the preloaded model scores the new rows,
+    signals are appended through TimeSeriesSignalWriter and bar-close -> signal latency is recorded.
+    """
+    def __init__(self, fetcher, model, streams, process_steps=None, process_params=None, feature_columns=None,
+                 writer=None, model_name='random_forest', run_id=None, output_dir=os.path.join('outputs', 'live'),
+                 clock=None, warmup=None, close_delay_ms=500, processor=None):
+        """
+        :param fetcher: DataFetcher (any backend: live, replay, synthetic).
+        :param model: Fitted model with predict(X) (e.g. RandomForestModel with predict_backend='flat').
+        :param streams: List of (symbol, timeframe) tuples.
+        :param process_steps: DataProcessor steps used at training time.
+        :param process_params: DataProcessor params used at training time.
+        :param feature_columns: Model input columns (default: the model's feature_names_in_).
+        :param warmup: Number of closed bars kept per stream for feature computation. Default: the processing
+                       steps' lookback (DataProcessor.lookback); a smaller value raises ValueError.
+        :param close_delay_ms: Wait after bar close before fetching, so the exchange has finalized the bar.
+        :param processor: DataProcessor fitted at training time (load_run_processor); required when the
+                          steps contain 'scale', so features are not rescaled on the warmup window.
+        """
+        self.fetcher = fetcher
+        self.model = model
+        self.streams = [tuple(s) for s in streams]
+        self.processor = self._live_processor(processor or DataProcessor(process_steps or []))
+        self.process_params = process_params or {}
+        self.feature_columns = list(feature_columns) if feature_columns is not None else self._model_features(model)
+        self.writer = writer or TimeSeriesSignalWriter()
+        self.model_name = model_name
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.output_dir = output_dir
+        self.clock = clock or SystemClock()
+        self.warmup = self._check_warmup(warmup)
+        self.close_delay_ms = close_delay_ms
+        self.state = {}
+        self.ticks = []
+
+    @staticmethod
+    def _live_processor(processor):
+        steps = list(processor.steps)
+        if 'remove_outliers' in steps:
+            # Canlıda satır atılamaz: yeni bar sessizce kaybolur
+            logger.warning("Live: 'remove_outliers' step is skipped (it would drop new bars).")
+            steps.remove('remove_outliers')
+        if 'scale' in steps and 'scale' not in processor.fitted:
+            raise ValueError("'scale' needs the scaler fitted at training time; pass the run's processor "
+                             "(load_run_processor) instead of refitting on the warmup window")
+        return DataProcessor(steps, fitted=processor.fitted)
+
+    def _check_warmup(self, warmup):
+        required = self.processor.lookback(self.process_params)
+        if warmup is None:
+            return required
+        if warmup < required:
+            # Kısa pencerede uzun EMA/rolling özellikler eğitimdekinden farklı (veya NaN) olur
+            raise ValueError(f"warmup={warmup} is shorter than the processing steps' lookback ({required} bars); "
+                             f"use warmup >= {required} or leave it unset")
+        return int(warmup)
+
+    @staticmethod
+    def _model_features(model):
+        names = getattr(getattr(model, 'model', model), 'feature_names_in_', None)
+        if names is None:
+            raise ValueError("feature_columns is required when the model has no feature_names_in_")
+        return list(names)
+
+    async def _call(self, fn, *args, **kwargs):
+        # Bloklayan borsa çağrıları event loop'u durdurmasın
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: fn(*args, **kwargs))
+
+    async def bootstrap(self):
+        """Load the last `warmup` closed bars for every stream."""
+        now = self.clock.now_ms()
+        for symbol, timeframe in self.streams:
+            df = await self._call(self.fetcher.fetch_data, symbol, timeframe, limit=self.warmup + 1)
+            tf = timeframe_to_ms(timeframe)
+            df = df[(_to_ms(df['timestamp']) + tf <= now).values].tail(self.warmup).reset_index(drop=True)
+            if df.empty:
+                raise ValueError(f"No closed bars returned for {symbol} {timeframe}; cannot start the live loop")
+            if len(df) < self.warmup:
+                logger.warning(f"Live: {symbol} {timeframe} için yalnızca {len(df)}/{self.warmup} warmup barı var; "
+                               f"özellikleri sonlu olmayan barlar atlanır.")
+            self.state[(symbol, timeframe)] = {'history': df, 'last_ts': int(_to_ms(df['timestamp']).iloc[-1])}
+            logger.info(f"Live: {symbol} {timeframe} için {len(df)} bar yüklendi.")
+
+    async def tick(self, symbol, timeframe, bar_close):
+        """Process one bar close for one stream; returns the tick record."""
+        t0 = time.perf_counter()
+        state = self.state[(symbol, timeframe)]
+        record = {'symbol': symbol, 'timeframe': timeframe, 'bar_close': bar_close, 'n_bars': 0, 'n_skipped': 0,
+                  'status': 'ok'}
+        try:
+            new = await self._call(self.fetcher.fetch_latest, symbol, timeframe, state['last_ts'])
+            ts = _to_ms(new['timestamp'])
+            # Sadece kapanmış ve daha önce görülmemiş barlar
+            new = new[((ts > state['last_ts']) & (ts + timeframe_to_ms(timeframe) <= bar_close)).values]
+            if new.empty:
+                record['status'] = 'no_new_bars'
+            else:
+                # Birden çok yeni barda en eskisi için de tam warmup geçmişi kalsın
+                history = pd.concat([state['history'], new], ignore_index=True)
+                history = history.tail(self.warmup + len(new) - 1).reset_index(drop=True)
+                state['history'] = history.tail(self.warmup).reset_index(drop=True)
+                state['last_ts'] = int(_to_ms(new['timestamp']).iloc[-1])
+                features = self.processor.process(history.copy(), self.process_params)
+                rows = features[features['timestamp'].isin(new['timestamp'])]
+                # Özellikleri sonlu olmayan (NaN/inf) satırlar skorlanmaz
+                finite = np.isfinite(rows[self.feature_columns].to_numpy(dtype=np.float64)).all(axis=1)
+                if not finite.all():
+                    record['n_skipped'] = int((~finite).sum())
+                    logger.warning(f"Live: {symbol} {timeframe} için {record['n_skipped']} bar sonlu olmayan "
+                                   f"özellikler nedeniyle atlandı.")
+                    rows = rows[finite]
+                if rows.empty:
+                    record['status'] = 'non_finite_features'
+                else:
+                    record['n_bars'] = self._score(symbol, timeframe, bar_close, new, rows)
+        except Exception as e:
+            logger.exception(f"Live tick hatası: {symbol} {timeframe} @ {bar_close}")
+            record['status'] = f'error: {e}'
+        record['latency_ms'] = self.clock.now_ms() - bar_close
+        record['processing_ms'] = (time.perf_counter() - t0) * 1000
+        self.ticks.append(record)
+        return record
+
+    def _score(self, symbol, timeframe, bar_close, new, rows):
+        preds = self.model.predict(rows[self.feature_columns])
+        latency_ms = self.clock.now_ms() - bar_close
+        signal_df = pd.DataFrame({
+            'timestamp': rows['timestamp'].values,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            # Ham fiyat (işlenmiş/ölçeklenmiş değil)
+            'close': new.set_index('timestamp')['close'].reindex(rows['timestamp']).values,
+            'predicted_signal': preds,
+            'latency_ms': latency_ms,
+        })
+        self.writer.append(signal_df, self.model_name, self.run_id, self.output_dir)
+        return len(rows)
+
+    async def run(self, max_ticks=None, until_ms=None):
+        """
+        Run the scheduler. Stops after max_ticks bar closes (over all streams) or when the clock passes until_ms.
+        """
+        if not self.state:
+            await self.bootstrap()
+        n_ticks = 0
+        while max_ticks is None or n_ticks < max_ticks:
+            now = self.clock.now_ms()
+            closes = {s: next_bar_close(now - self.close_delay_ms, s[1]) for s in self.streams}
+            bar_close = min(closes.values())
+            if until_ms is not None and bar_close > until_ms:
+                break
+            await self.clock.sleep_until(bar_close + self.close_delay_ms)
+            due = [s for s, c in closes.items() if c == bar_close]
+            await asyncio.gather(*(self.tick(symbol, timeframe, bar_close) for symbol, timeframe in due))
+            n_ticks += 1
+        return self.ticks
+
+    def run_forever(self, **kwargs):
+        return asyncio.run(self.run(**kwargs))
+
+    def latency_frame(self):
+        """Tick records as a DataFrame (one row per stream and bar close)."""
+        return pd.DataFrame(self.ticks)
+
+
+def load_run_model(run_dir, predict_backend='flat'):
+    """Load model.pkl from an outputs/<model>_<run_id> directory for live scoring."""
+    from src.models.random_forest import RandomForestModel
+    model = RandomForestModel(predict_backend=predict_backend).load(os.path.join(run_dir, 'model.pkl'))
+    if predict_backend == 'flat':
+        model.compile()
+    return model
+
+def load_run_processor(run_dir):
+    """Load the fitted DataProcessor (processor.pkl) of a run, or None for runs saved before it existed."""
+    path = os.path.join(run_dir, 'processor.pkl')
+    return DataProcessor.load_state(path) if os.path.exists(path) else None
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# loop = LiveSignalLoop(DataFetcher('binance'), load_run_model('outputs/random_forest_20250706_123456'),
+#                       streams=[('BTC/USDT', '1h'), ('ETH/USDT', '1h')],
+#                       process_steps=['fillna', 'add_indicators'], process_params={'add_indicators': {'indicators': ['rsi', 'ema', 'sma']}})
+# loop.run_forever()
@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+from loguru import logger
+
+DEFAULT_CATALOG_PATH = os.path.join('outputs', 'catalog.sqlite')
+RUN_DIR_PATTERN = re.compile(r'^(?P<model>.+)_(?P<run_id>\d{8}_\d{6})$')
+
+# Sorgulanabilir/sıralanabilir kolonlar (SQL enjeksiyonuna karşı beyaz liste)
+COLUMNS = {
+    'run_key': 'TEXT PRIMARY KEY',
+    'run_id': 'TEXT',
+    'model_name': 'TEXT',
+    'created_at': 'TEXT',
+    'exchange': 'TEXT',
+    'symbol': 'TEXT',
+    'timeframe': 'TEXT',
+    'accuracy': 'REAL',
+    'f1': 'REAL',
+    'precision': 'REAL',
+    'recall': 'REAL',
+    'cum_strategy_return': 'REAL',
+    'sharpe': 'REAL',
+    'n_train': 'INTEGER',
+    'n_test': 'INTEGER',
+    'duration_s': 'REAL',
+    'run_dir': 'TEXT',
+    'config_json': 'TEXT',
+    'metrics_json': 'TEXT',
+    'artifacts_json': 'TEXT',
+    'timings_json': 'TEXT',
+}
+INDEXED = ['model_name', 'created_at', 'symbol, timeframe', 'accuracy', 'f1', 'cum_strategy_return', 'sharpe']
+SUMMARY_COLUMNS = ['run_key', 'model_name', 'symbol', 'timeframe', 'created_at', 'accuracy', 'f1', 'precision',
+                   'recall', 'cum_strategy_return', 'sharpe', 'n_test', 'duration_s', 'run_dir']
+ARTIFACTS = ['signals.csv', 'metrics.csv', 'backtest.csv', 'model.pkl', 'model_meta.json', 'processor.pkl']
+_OPS = ('>=', '<=', '!=', '=', '>', '<', '~')
+
+
+class RunCatalogException(Exception):
+    pass
+
+
+def backtest_summary(backtest_df):
+    """Final cumulative strategy return and simple Sharpe (same definition as the analysis panel)."""
+    summary = {}
+    if 'cum_strategy_return' in backtest_df.columns and len(backtest_df):
+        summary['cum_strategy_return'] = float(backtest_df['cum_strategy_return'].iloc[-1])
+    if 'strategy_return' in backtest_df.columns:
+        ret = backtest_df['strategy_return']
+        summary['sharpe'] = float(ret.mean() / (ret.std() + 1e-8))
+    return summary
+
+
+def parse_filter(expr):
+    """
+    Parse a CLI filter like 'f1>=0.4', 'symbol=BTC/USDT' or 'model_name~forest' (substring match).
+    :return: (column, op, value)
+    """
+    for op in _OPS:
+        if op in expr:
+            column, value = (part.strip() for part in expr.split(op, 1))
+            return validate_filter(column, op, value)
+    raise RunCatalogException(f"Invalid filter expression: {expr}")
+
+
+def validate_filter(column, op, value):
+    """Check a (column, op, value) filter against the column whitelist and operators; numeric values are cast."""
+    if column not in COLUMNS:
+        raise RunCatalogException(f"Unknown column in filter: {column}")
+    if op not in _OPS:
+        raise RunCatalogException(f"Unknown filter operator: {op}")
+    if COLUMNS[column] in ('REAL', 'INTEGER') and op != '~':
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise RunCatalogException(f"Numeric value expected for {column}: {value!r}")
+    return column, op, value
+
+
+def _quoted(columns):
+    return ', '.join(f'"{c}"' for c in columns)
+
+
+class RunCatalog:
+    """
+    Embedded SQLite index of pipeline runs (outputs/<model>_<run_id>/).
+    One row per run with config, metrics, artifact paths and stage timings; metric columns are indexed
+    so filtered/sorted queries and leaderboards stay fast with thousands of runs.
+    """
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            cols = ', '.join(f'"{name}" {kind}' for name, kind in COLUMNS.items())
+            conn.execute(f'CREATE TABLE IF NOT EXISTS runs ({cols})')
+            for idx in INDEXED:
+                name = 'idx_runs_' + re.sub(r'\W+', '_', idx)
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON runs ({idx})')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record_run(self, run_dir, model_name=None, run_id=None, config=None, metrics=None, backtest=None,
+                   timings=None, n_train=None, n_test=None, created_at=None, artifacts=None):
+        """
+        Insert or replace one run.
+        :param metrics: dict with accuracy/f1/precision/recall (extra keys are kept in metrics_json).
+        :param backtest: dict from backtest_summary().
+        :param timings: dict of stage -> seconds; 'total' becomes duration_s.
+        """
+        run_key = os.path.basename(os.path.normpath(run_dir))
+        match = RUN_DIR_PATTERN.match(run_key)
+        model_name = model_name or (match.group('model') if match else None)
+        run_id = run_id or (match.group('run_id') if match else None)
+        if created_at is None and run_id:
+            created_at = datetime.strptime(run_id, '%Y%m%d_%H%M%S').isoformat()
+        config = config or {}
+        metrics = metrics or {}
+        backtest = backtest or {}
+        timings = timings or {}
+        if artifacts is None:
+            artifacts = {name: os.path.join(run_dir, name) for name in ARTIFACTS
+                         if os.path.exists(os.path.join(run_dir, name))}
+        row = {
+            'run_key': run_key, 'run_id': run_id, 'model_name': model_name, 'created_at': created_at,
+            'exchange': config.get('exchange'), 'symbol': config.get('symbol'), 'timeframe': config.get('timeframe'),
+            'accuracy': metrics.get('accuracy'), 'f1': metrics.get('f1'),
+            'precision': metrics.get('precision'), 'recall': metrics.get('recall'),
+            'cum_strategy_return': backtest.get('cum_strategy_return'), 'sharpe': backtest.get('sharpe'),
+            'n_train': n_train, 'n_test': n_test, 'duration_s': timings.get('total'),
+            'run_dir': run_dir,
+            'config_json': json.dumps(config, default=str),
+            'metrics_json': json.dumps(metrics, default=str),
+            'artifacts_json': json.dumps(artifacts),
+            'timings_json': json.dumps(timings),
+        }
+        with self._connect() as conn:
+            conn.execute(f'INSERT OR REPLACE INTO runs ({_quoted(row)}) VALUES ({", ".join("?" for _ in row)})',
+                         list(row.values()))
+        return run_key
+
+    def query(self, filters=None, order_by='created_at', descending=True, limit=50, columns=None):
+        """
+        Filtered, sorted query.
+        :param filters: List of filter expressions ('f1>=0.4') or (column, op, value) tuples.
+        :return: DataFrame.
+        """
+        columns = columns or SUMMARY_COLUMNS
+        for col in list(columns) + [order_by]:
+            if col not in COLUMNS:
+                raise RunCatalogException(f"Unknown column: {col}")
+        where, params = [], []
+        for f in filters or []:
+            column, op, value = parse_filter(f) if isinstance(f, str) else validate_filter(*f)
+            if op == '~':
+                where.append(f'"{column}" LIKE ?')
+                params.append(f'%{value}%')
+            else:
+                where.append(f'"{column}" {op} ?')
+                params.append(value)
+        sql = f'SELECT {_quoted(columns)} FROM runs'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        # NULL değerler her zaman sonda
+        sql += f' ORDER BY "{order_by}" IS NULL, "{order_by}" {"DESC" if descending else "ASC"}'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def leaderboard(self, metric='f1', limit=10, filters=None):
+        """Top runs by a metric (highest first); runs without the metric are excluded."""
+        filters = list(filters or []) + [(metric, '>', float('-inf'))]
+        return self.query(filters=filters, order_by=metric, limit=limit)
+
+    def get(self, run_key):
+        """Full row of a run with JSON fields decoded."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM runs WHERE run_key = ?', (run_key,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        for key in [k for k in run if k.endswith('_json')]:
+            run[key[:-5]] = json.loads(run.pop(key)) if run[key] else None
+        return run
+
+    def run_keys(self):
+        with self._connect() as conn:
+            return {r[0] for r in conn.execute('SELECT run_key FROM runs')}
+
+    def backfill(self, outputs_dir='outputs', force=False):
+        """
+        Index existing run folders (metrics.csv, model_meta.json, backtest.csv, signals.csv).
+        Already indexed runs are skipped unless force=True.
+        :return: Number of indexed runs.
+        """
+        if not os.path.isdir(outputs_dir):
+            return 0
+        known = set() if force else self.run_keys()
+        count = 0
+        for name in sorted(os.listdir(outputs_dir)):
+            run_dir = os.path.join(outputs_dir, name)
+            if name in known or not os.path.isdir(run_dir) or not RUN_DIR_PATTERN.match(name):
+                continue
+            try:
+                self._index_run_dir(run_dir)
+                count += 1
+            except Exception as e:
+                logger.warning(f"Run indekslenemedi: {run_dir}: {e}")
+        logger.info(f"Katalog backfill: {count} run indekslendi ({outputs_dir}).")
+        return count
+
+    def _index_run_dir(self, run_dir):
+        metrics, backtest, config, n_test = {}, {}, {}, None
+        metrics_path = os.path.join(run_dir, 'metrics.csv')
+        if os.path.exists(metrics_path):
+            metrics = pd.read_csv(metrics_path).iloc[0].to_dict()
+        meta_path = os.path.join(run_dir, 'model_meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            config = {'model_params': meta.get('params', {}), 'task': meta.get('task')}
+            metrics = metrics or meta.get('metrics', {})
+        backtest_path = os.path.join(run_dir, 'backtest.csv')
+        if os.path.exists(backtest_path):
+            backtest = backtest_summary(pd.read_csv(backtest_path, usecols=lambda c: c in ('cum_strategy_return', 'strategy_return')))
+        signals_path = os.path.join(run_dir, 'signals.csv')
+        if os.path.exists(signals_path):
+            with open(signals_path, 'rb') as f:
+                n_test = max(sum(1 for _ in f) - 1, 0)
+        self.record_run(run_dir, config=config, metrics=metrics, backtest=backtest, n_test=n_test)
+
+# Kullanım örneği (üretim ortamında kaldırılmalı):
+# catalog = RunCatalog()
+# catalog.backfill('outputs')
+# catalog.leaderboard('sharpe', limit=10, filters=['symbol=BTC/USDT', 'n_test>=200'])
@@ -23,6 +23,15 @@ class TimeSeriesSignalWriter(BaseSignalWriter):
         signal_df.to_csv(path, index=False)
         return path
 
+    def append(self, signal_df: pd.DataFrame, model_name: str, run_id: str, output_dir: str = 'outputs'):
+        """
+        Aynı run_id dosyasına yeni sinyal satırlarını ekler (canlı döngü için). Başlık yalnızca ilk yazımda yazılır.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"signals_{model_name}_{run_id}.csv")
+        signal_df.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+        return path
+
 # Kullanım örneği (üretim ortamında kaldırılmalı):
 # writer = TimeSeriesSignalWriter()
 # path = writer.save(signal_df, model_name='random_forest', run_id='20250706_123456')
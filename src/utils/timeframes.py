@@ -0,0 +1,33 @@
+_UNITS_MS = {
+    's': 1000,
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+}
+# Unix epoch bir perşembe; borsaların haftalık barları pazartesi 00:00 UTC'de açılır
+_WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def timeframe_to_ms(timeframe):
+    """
+    CCXT tarzı timeframe'i milisaniyeye çevirir (örn. '1m' -> 60000, '4h' -> 14400000).
+    Aylık ('1M') timeframe sabit uzunlukta olmadığı için desteklenmez.
+    """
+    try:
+        amount, unit = int(timeframe[:-1]), timeframe[-1]
+        return amount * _UNITS_MS[unit]
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def bar_open(timestamp_ms, timeframe):
+    """Open time (ms) of the bar containing timestamp_ms (weekly bars open on Monday 00:00 UTC)."""
+    tf = timeframe_to_ms(timeframe)
+    offset = _WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+    return ((int(timestamp_ms) - offset) // tf) * tf + offset
+
+
+def next_bar_close(timestamp_ms, timeframe):
+    """Close time (ms) of the bar containing timestamp_ms (= open time of the next bar)."""
+    return bar_open(timestamp_ms, timeframe) + timeframe_to_ms(timeframe)
@@ -0,0 +1,170 @@
+import pandas as pd
+import numpy as np
+import pytest
+from src.data.bar_builder import BarBuilder, build_bars, bars_from_chunks, OHLCV_COLUMNS
+from src.data.trade_store import TradeStore
+from src.data.synthetic_trades import generate_synthetic_trades
+from src.data.data_fetcher import DataFetcher
+from src.data.data_processor import DataProcessor
+from src.data.label_generator import PriceDirectionLabelGenerator
+from src.data.exchange_backends import BaseExchangeBackend, RecordingBackend, ReplayBackend, SyntheticExchangeBackend
+
+class TapeExchange(BaseExchangeBackend):
+    """Fixed trade tape with many trades per millisecond (exchange-style since/limit paging)."""
+    def __init__(self, ts, price, amount):
+        self.data = np.column_stack([ts, price, amount]).astype(float)
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        raise NotImplementedError
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        self.calls += 1
+        data = self.data if since is None else self.data[np.searchsorted(self.data[:, 0], since):]
+        return [[int(t), p, a] for t, p, a in data[:limit].tolist()]
+
+def naive_bars(price, amount, measure, threshold):
+    bars, start, acc = [], 0, 0.0
+    for i in range(len(price)):
+        acc += measure[i]
+        if acc >= threshold:
+            bars.append((price[start], price[start:i + 1].max(), price[start:i + 1].min(), price[i],
+                         amount[start:i + 1].sum()))
+            # Eşiği aşan kısım bir sonraki bara devreder
+            acc -= np.floor(acc / threshold) * threshold
+            start = i + 1
+    return np.array(bars)
+
+@pytest.mark.parametrize('bar_type,threshold', [('tick', 7), ('volume', 1.5), ('dollar', 40000.0)])
+def test_bars_match_naive_loop(bar_type, threshold):
+    ts, price, amount = generate_synthetic_trades(2000, seed=1)
+    bars = build_bars(ts, price, amount, bar_type=bar_type, threshold=threshold)
+    measure = {'tick': np.ones(len(price)), 'volume': amount, 'dollar': price * amount}[bar_type]
+    expected = naive_bars(price, amount, measure, threshold)
+    assert list(bars.columns) == OHLCV_COLUMNS
+    assert len(bars) == len(expected) > 10
+    np.testing.assert_allclose(bars[['open', 'high', 'low', 'close', 'volume']].values, expected)
+    if bar_type == 'tick':
+        assert (bars['volume'].values > 0).all()
+        assert len(bars) == len(price) // threshold
+
+def test_chunked_equals_one_shot():
+    ts, price, amount = generate_synthetic_trades(5000, seed=2)
+    one_shot = build_bars(ts, price, amount, bar_type='dollar', threshold=25000.0, include_partial=True)
+    bounds = [0, 1, 17, 900, 901, 2500, 5000]
+    chunks = [(ts[a:b], price[a:b], amount[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+    chunked = bars_from_chunks(chunks, bar_type='dollar', threshold=25000.0, include_partial=True)
+    pd.testing.assert_frame_equal(chunked, one_shot, check_exact=False)
+    assert chunked['volume'].sum() == pytest.approx(amount.sum())
+
+def test_bar_spanning_many_chunks_keeps_bounded_state():
+    ts, price, amount = generate_synthetic_trades(50_000, seed=5)
+    builder = BarBuilder('volume', amount[:42_000].sum() + amount[42_000] / 2)
+    for a in range(0, len(ts), 5_000):
+        builder.update(ts[a:a + 5_000], price[a:a + 5_000], amount[a:a + 5_000])
+        # Açık bar için yalnızca skaler özet tutulur
+        assert all(np.ndim(v) == 0 for v in builder._open.values())
+    one_shot = build_bars(ts, price, amount, bar_type='volume', threshold=builder.threshold, include_partial=True)
+    builder = BarBuilder('volume', builder.threshold)
+    chunked = bars_from_chunks(((ts[a:a + 5_000], price[a:a + 5_000], amount[a:a + 5_000])
+                                for a in range(0, len(ts), 5_000)), 'volume', builder.threshold, include_partial=True)
+    pd.testing.assert_frame_equal(chunked, one_shot, check_exact=False)
+    expected = naive_bars(price, amount, amount, builder.threshold)
+    np.testing.assert_allclose(chunked[['open', 'high', 'low', 'close', 'volume']].values[:len(expected)], expected)
+
+def test_builder_validates_arguments():
+    with pytest.raises(ValueError):
+        BarBuilder('range', 10)
+    with pytest.raises(ValueError):
+        BarBuilder('volume', 0)
+    assert BarBuilder('tick', 5).update([], [], []).empty
+
+def test_bars_feed_processor_and_labels():
+    ts, price, amount = generate_synthetic_trades(20000, seed=3)
+    bars = build_bars(ts, price, amount, bar_type='volume', threshold=2.0)
+    processor = DataProcessor(['add_indicators'])
+    df = processor.process(bars, {'add_indicators': {'indicators': ['rsi', 'ema']}})
+    assert {'rsi', 'ema'}.issubset(df.columns)
+    labels = PriceDirectionLabelGenerator().generate(df, n=1)
+    assert len(labels) == len(df)
+
+def test_trade_store_roundtrip_and_range(tmp_path):
+    store = TradeStore(str(tmp_path / 'trades'))
+    ts, price, amount = generate_synthetic_trades(1000, seed=4)
+    store.append(ts[:600], price[:600], amount[:600])
+    store.append(ts[600:], price[600:], amount[600:])
+    assert len(store) == 1000 and store.last_timestamp() == ts[-1]
+    got = np.concatenate([c[0] for c in store.iter_chunks(since=ts[100], until=ts[800])])
+    np.testing.assert_array_equal(got, ts[(ts >= ts[100]) & (ts < ts[800])])
+
+def shared_timestamp_tape(group):
+    ts = np.repeat(np.arange(1000, 1100), 7)
+    ts[350:350 + group] = ts[350]
+    return ts, np.linspace(100, 110, len(ts)), np.arange(len(ts), dtype=float) + 1
+
+def test_download_trades_dedups_shared_timestamps(tmp_path):
+    # Aynı milisaniyede çok sayıda işlem: sayfa sınırında kayıp/tekrar olmamalı
+    ts, price, amount = shared_timestamp_tape(20)
+    fetcher = DataFetcher('fake', backend=TapeExchange(ts, price, amount))
+    store = fetcher.download_trades('BTC/USDT', since=0, limit=25, store=TradeStore(str(tmp_path / 'trades')))
+    stored = np.concatenate([c[2] for c in store.iter_chunks()])
+    np.testing.assert_array_equal(stored, amount)
+    # Devam: yeni işlem yoksa hiçbir şey eklenmez
+    fetcher.download_trades('BTC/USDT', limit=25, store=store)
+    assert len(store) == len(ts)
+
+def test_download_trades_resumes_inside_stored_range(tmp_path):
+    ts, price, amount = shared_timestamp_tape(20)
+    exchange = TapeExchange(ts, price, amount)
+    store = TradeStore(str(tmp_path / 'trades'))
+    fetcher = DataFetcher('fake', backend=exchange)
+    # Yarıda kesilen indirme, sonra daha erken bir since ile tekrar
+    fetcher.download_trades('BTC/USDT', since=0, limit=25, store=store, max_pages=15)
+    exchange.data = exchange.data[:363]  # sınır milisaniyesinin ortasında bitmiş borsa
+    fetcher.download_trades('BTC/USDT', since=0, limit=25, store=store)
+    exchange.data = np.column_stack([ts, price, amount]).astype(float)
+    fetcher.download_trades('BTC/USDT', since=1000, limit=25, store=store)
+    stored = np.concatenate([c[2] for c in store.iter_chunks()])
+    np.testing.assert_array_equal(stored, amount)
+    assert store.boundary() == (1099, 7)
+    with pytest.raises(ValueError):
+        store.append(ts[:5], price[:5], amount[:5])
+    with pytest.raises(ValueError):
+        store.append(ts[::-1], price, amount)
+
+def test_download_trades_skips_over_full_millisecond(tmp_path):
+    # limit'ten fazla işlem aynı milisaniyede: sonsuz döngü yerine bir ms ileri atlanır
+    ts, price, amount = shared_timestamp_tape(30)
+    exchange = TapeExchange(ts, price, amount)
+    store = DataFetcher('fake', backend=exchange).download_trades(
+        'BTC/USDT', since=0, limit=25, store=TradeStore(str(tmp_path / 'trades')))
+    assert len(store) == len(ts) - 5
+    assert exchange.calls < 40
+
+def test_download_trades_full_new_millisecond_on_first_page(tmp_path):
+    # İlk sayfa tamamen yeni ve limit'ten kalabalık bir milisaniye: sonraki sayfa yalnızca tekrar içerir
+    ts = np.r_[np.full(30, 1000), np.arange(1001, 1101)]
+    price, amount = np.full(len(ts), 100.0), np.arange(len(ts), dtype=float) + 1
+    exchange = TapeExchange(ts, price, amount)
+    store = DataFetcher('fake', backend=exchange).download_trades(
+        'BTC/USDT', since=0, limit=25, store=TradeStore(str(tmp_path / 'trades')))
+    stored = np.concatenate([c[2] for c in store.iter_chunks()])
+    # Yalnızca 1000 ms'deki limit fazlası 5 işlem kaybolur
+    np.testing.assert_array_equal(stored, np.r_[amount[:25], amount[30:]])
+
+def test_fetch_bars_from_recorded_trades(tmp_path):
+    synthetic = SyntheticExchangeBackend(now_fn=lambda: 1_700_000_000_000, trade_interval_ms=1000)
+    path = str(tmp_path / 'trades.npz')
+    recorder = RecordingBackend(synthetic, path)
+    since = 1_700_000_000_000 - 3000 * 1000
+    fetcher = DataFetcher('binance', backend=recorder)
+    fetcher.download_trades('BTC/USDT', since=since, limit=500, store=TradeStore(str(tmp_path / 'live')))
+    recorder.close()
+    replay = DataFetcher('binance', backend=ReplayBackend(path))
+    store = TradeStore(str(tmp_path / 'replay'))
+    bars = replay.fetch_bars('BTC/USDT', bar_type='tick', threshold=100, since=since, store=store, limit=500)
+    assert len(store) == 3001
+    assert len(bars) == 30
+    assert bars['timestamp'].is_monotonic_increasing
+    direct = build_bars(*next(TradeStore(str(tmp_path / 'live')).iter_chunks()), bar_type='tick', threshold=100)
+    assert direct['timestamp'].iloc[0] == bars['timestamp'].iloc[0]
@@ -3,6 +3,7 @@ import numpy as np
 import pytest
 from src.data.data_processor import DataProcessor, DataProcessingException
 from src.data.data_fetcher import DataFetcher
+from src.data.exchange_backends import RecordingBackend, ReplayBackend, BaseExchangeBackend
 
 def get_sample_df():
     data = {
@@ -49,8 +50,19 @@ def test_exception():
     else:
         assert False, "Exception not raised!"
 
-def test_integration_with_datafetcher():
-    fetcher = DataFetcher('binance')
+class FakeExchange(BaseExchangeBackend):
+    # Deterministik OHLCV: ağ bağlantısı olmadan kayıt almak için
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        rng = np.random.default_rng(0)
+        close = 30000 + np.cumsum(rng.normal(0, 50, limit))
+        start = since if since is not None else 1_700_000_000_000
+        return [[start + i * 3_600_000, c - 5, c + 20, c - 20, c, 10.0 + i] for i, c in enumerate(close)]
+
+def test_integration_with_datafetcher(tmp_path):
+    cassette = str(tmp_path / 'btc_1h.npz')
+    with RecordingBackend(FakeExchange(), cassette) as recorder:
+        recorder.fetch_ohlcv('BTC/USDT', '1h', limit=20)
+    fetcher = DataFetcher('binance', backend=ReplayBackend(cassette))
     df = fetcher.fetch_data('BTC/USDT', '1h', limit=20)
     processor = DataProcessor(['fillna', 'add_indicators', 'scale'])
     params = {
@@ -0,0 +1,95 @@
+import pandas as pd
+import numpy as np
+import pytest
+from src.data.data_fetcher import DataFetcher, DataFetcherException
+from src.data.exchange_backends import (RecordingBackend, ReplayBackend, BaseExchangeBackend,
+                                        ExchangeBackendError, create_backend)
+
+class CountingExchange(BaseExchangeBackend):
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        start = since if since is not None else 0
+        return [[start + i * 60_000, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 100.0] for i in range(limit)]
+
+def record(tmp_path):
+    path = str(tmp_path / 'cassette.npz')
+    with RecordingBackend(CountingExchange(), path) as recorder:
+        first = recorder.fetch_ohlcv('BTC/USDT', '1m', since=0, limit=50)
+        recorder.fetch_ohlcv('BTC/USDT', '1m', since=50 * 60_000, limit=50)
+    return path, first
+
+def test_replay_matches_recording(tmp_path):
+    path, first = record(tmp_path)
+    replay = ReplayBackend(path)
+    assert replay.fetch_ohlcv('BTC/USDT', '1m', since=0, limit=50) == first
+    # Kayıtlar birleştirilir: kayıt aralığı içindeki herhangi bir since/limit
+    rows = replay.fetch_ohlcv('BTC/USDT', '1m', since=40 * 60_000, limit=20)
+    assert [r[0] for r in rows] == [(40 + i) * 60_000 for i in range(20)]
+    assert replay.fetch_ohlcv('BTC/USDT', '1m', limit=5)[-1][0] == 99 * 60_000
+
+def test_datafetcher_replay_is_deterministic(tmp_path):
+    path, _ = record(tmp_path)
+    fetcher = DataFetcher('binance', backend=create_backend('binance', 'replay', path))
+    df = fetcher.fetch_data('BTC/USDT', '1m', limit=100, since=0)
+    latest = fetcher.fetch_latest('BTC/USDT', '1m', last_timestamp=df['timestamp'].iloc[-10])
+    assert len(df) == 100 and len(latest) == 10
+    assert latest['timestamp'].iloc[0] == pd.Timestamp(90 * 60_000, unit='ms')
+
+def test_error_injection_and_latency(tmp_path):
+    path, _ = record(tmp_path)
+    replay = ReplayBackend(path, latency=0.01, fail_on=[2])
+    fetcher = DataFetcher('binance', backend=replay)
+    fetcher.fetch_data('BTC/USDT', '1m', limit=10)
+    with pytest.raises(DataFetcherException):
+        fetcher.fetch_data('BTC/USDT', '1m', limit=10)
+    assert replay.calls == 2
+    with pytest.raises(ExchangeBackendError):
+        ReplayBackend(path, error_rate=1.0).fetch_ohlcv('BTC/USDT', '1m', limit=1)
+    with pytest.raises(ExchangeBackendError):
+        ReplayBackend(path).fetch_ohlcv('ETH/USDT', '1m', limit=1)
+
+def test_create_backend_requires_path():
+    with pytest.raises(ValueError):
+        create_backend('binance', 'replay')
+
+def test_recording_writes_once_on_close(tmp_path):
+    path = tmp_path / 'cassette.npz'
+    recorder = RecordingBackend(CountingExchange(), str(path))
+    for i in range(20):
+        recorder.fetch_ohlcv('BTC/USDT', '1m', since=i * 10 * 60_000, limit=10)
+    assert not path.exists()
+    recorder.close()
+    assert len(ReplayBackend(str(path)).fetch_ohlcv('BTC/USDT', '1m', since=0, limit=500)) == 200
+    # Mevcut kayıtlar korunur
+    with RecordingBackend(CountingExchange(), str(path)) as recorder:
+        recorder.fetch_ohlcv('BTC/USDT', '1m', since=200 * 60_000, limit=10)
+    assert len(ReplayBackend(str(path)).fetch_ohlcv('BTC/USDT', '1m', since=0, limit=500)) == 210
+
+class TradeTape(BaseExchangeBackend):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        raise NotImplementedError
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        rows = [r for r in self.rows if since is None or r[0] >= since]
+        return rows[:limit] if since is not None else rows[-limit:]
+
+def test_replay_keeps_identical_fills(tmp_path):
+    # Aynı milisaniyede birebir aynı işlemler ayrı işlemlerdir
+    rows = [[1000, 10.0, 0.5], [1000, 10.0, 0.5], [1000, 10.0, 0.5], [1001, 11.0, 1.0], [1001, 11.0, 1.0],
+            [1002, 12.0, 1.0], [1003, 12.0, 2.0], [1003, 12.0, 2.0]]
+    path = str(tmp_path / 'trades.npz')
+    with RecordingBackend(TradeTape(rows), path) as recorder:
+        recorder.fetch_trades('BTC/USDT', since=1000, limit=3)
+        recorder.fetch_trades('BTC/USDT', since=1000, limit=4)  # sınır milisaniyesi tekrar gelir
+        recorder.fetch_trades('BTC/USDT', since=1001, limit=4)
+        recorder.fetch_trades('BTC/USDT', since=1003, limit=1)  # limit milisaniyeyi keser
+        recorder.fetch_trades('BTC/USDT', since=1003, limit=10)
+    replay = ReplayBackend(path)
+    assert replay.fetch_trades('BTC/USDT', since=0, limit=100) == rows
+    assert replay.fetch_trades('BTC/USDT', limit=3) == rows[-3:]
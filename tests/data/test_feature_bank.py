@@ -0,0 +1,72 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+from src.data.data_processor import DataProcessor
+from src.data.feature_bank import build_feature_bank, feature_bank_columns, ema_bank
+
+def get_price_series(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(30000 + np.cumsum(rng.normal(0, 50, n)))
+
+def test_rolling_families_match_pandas():
+    close = get_price_series()
+    windows = [3, 14, 50]
+    matrix, names = build_feature_bank(close.values, windows=windows, families=['sma', 'volatility', 'momentum'])
+    bank = pd.DataFrame(matrix, columns=names)
+    for w in windows:
+        pd.testing.assert_series_equal(bank[f'sma_{w}'], close.rolling(w).mean(), check_names=False, rtol=1e-9)
+        pd.testing.assert_series_equal(bank[f'volatility_{w}'], close.rolling(w).std(), check_names=False, rtol=1e-6)
+        pd.testing.assert_series_equal(bank[f'momentum_{w}'], close - close.shift(w), check_names=False)
+
+def test_ema_rsi_macd_match_processor():
+    close = get_price_series()
+    processor = DataProcessor([])
+    matrix, names = build_feature_bank(close.values, windows=[12, 14, 26], families=['ema', 'rsi', 'macd'])
+    bank = pd.DataFrame(matrix, columns=names)
+    pd.testing.assert_series_equal(bank['ema_14'], close.ewm(span=14, adjust=False).mean(), check_names=False, rtol=1e-9)
+    pd.testing.assert_series_equal(bank['rsi_14'], processor._rsi(close, period=14), check_names=False, rtol=1e-6)
+    pd.testing.assert_series_equal(bank['macd_12_26'], processor._macd(close), check_names=False, rtol=1e-6)
+
+def test_volatility_stays_precise_on_long_series():
+    # 2M bar, 60k civarında rastgele yürüyüş: kümülatif kareler toplamı hassasiyet kaybetmemeli
+    rng = np.random.default_rng(0)
+    close = pd.Series(60000 + np.cumsum(rng.normal(0, 1, 2_000_000)))
+    matrix, names = build_feature_bank(close.values, windows=[5, 200], families=['volatility'])
+    exact = sliding_window_view(close.values, 5).std(axis=1, ddof=1)
+    np.testing.assert_allclose(matrix[4:, 0], exact, rtol=1e-6)
+    for j, w in enumerate([5, 200]):
+        np.testing.assert_allclose(matrix[:, j], close.rolling(w).std().values, rtol=1e-6, atol=1e-3)
+
+def test_ema_nan_gaps_match_pandas():
+    close = get_price_series(2000, seed=1)
+    close[np.random.default_rng(2).random(len(close)) < 0.05] = np.nan
+    close.iloc[:3] = np.nan
+    close.iloc[-2:] = np.nan
+    spans = [2, 5, 14, 26]
+    emas = ema_bank(close.values, spans)
+    for j, span in enumerate(spans):
+        expected = close.ewm(span=span, adjust=False).mean().values
+        np.testing.assert_allclose(emas[:, j], expected, rtol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize('windows', [[0, 3], [2.5], [-1], [True]])
+def test_invalid_windows_raise(windows):
+    with pytest.raises(ValueError, match='windows must be integers'):
+        build_feature_bank(get_price_series(50).values, windows=windows, families=['momentum'])
+
+def test_nan_windows_propagate_like_pandas():
+    close = get_price_series(50)
+    close.iloc[20] = np.nan
+    matrix, names = build_feature_bank(close.values, windows=[5], families=['sma'])
+    expected = close.rolling(5).mean()
+    assert np.allclose(matrix[:, 0], expected.values, equal_nan=True)
+
+def test_add_feature_bank_step():
+    df = pd.DataFrame({'close': get_price_series(300), 'volume': np.arange(300, dtype=float)})
+    windows = list(range(2, 42))
+    processor = DataProcessor(['add_feature_bank'])
+    params = {'add_feature_bank': {'windows': windows}}
+    result = processor.process(df, params)
+    names = feature_bank_columns(windows)
+    assert len(names) > 200
+    assert list(result.columns) == ['close', 'volume'] + names
@@ -0,0 +1,41 @@
+import pandas as pd
+import numpy as np
+from src.data.data_processor import DataProcessor
+from src.data.lag_matrix import LagMatrix
+
+def get_sample_df(n=30):
+    return pd.DataFrame({'close': np.arange(n, dtype=float), 'volume': np.arange(n, dtype=float) * 10})
+
+def test_columns_mode_matches_shift():
+    df = get_sample_df()
+    processor = DataProcessor(['add_lagged_features'])
+    params = {'add_lagged_features': {'columns': ['close', 'volume'], 'lags': 3}}
+    result = processor.process(df.copy(), params)
+    assert list(result.columns[2:]) == [f'{c}_lag{l}' for c in ['close', 'volume'] for l in range(1, 4)]
+    for col in ['close', 'volume']:
+        for lag in range(1, 4):
+            pd.testing.assert_series_equal(result[f'{col}_lag{lag}'], df[col].shift(lag), check_names=False)
+
+def test_matrix_mode_is_lazy_view():
+    df = get_sample_df()
+    processor = DataProcessor(['add_lagged_features'])
+    params = {'add_lagged_features': {'columns': ['close', 'volume'], 'lags': range(1, 21), 'mode': 'matrix'}}
+    result = processor.process(df, params)
+    assert list(result.columns) == ['close', 'volume']
+    lm = processor.lag_matrix
+    view = lm.view()
+    assert view.shape == (30, 2, 20)
+    assert np.shares_memory(view, lm._padded)
+    assert np.shares_memory(lm.lag('close', 5), lm._padded)
+    np.testing.assert_array_equal(lm.lag('close', 5), df['close'].shift(5).values)
+
+def test_sequences_and_sparse_lags():
+    df = get_sample_df()
+    lm = LagMatrix.from_frame(df, ['close'], lags=[1, 2, 8])
+    arr = lm.to_array()
+    assert arr.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(arr[10], [9.0, 8.0, 2.0])
+    seq = LagMatrix.from_frame(df, ['close', 'volume'], lags=4).to_sequences()
+    assert seq.shape == (30, 4, 2)
+    np.testing.assert_array_equal(seq[10, :, 0], [6.0, 7.0, 8.0, 9.0])
+    assert lm.valid_rows().sum() == 30 - 8
@@ -0,0 +1,43 @@
+import pandas as pd
+import numpy as np
+import pytest
+from src.evaluation.backtest import simple_backtest
+from src.evaluation.monte_carlo import monte_carlo_test, backtest_monte_carlo, monte_carlo_report, path_statistics
+
+def get_backtest_df(n=2000, seed=0, skill=0.0):
+    rng = np.random.default_rng(seed)
+    ret = rng.normal(0, 0.01, n)
+    close = 100 * np.cumprod(1 + ret)
+    future = np.r_[ret[1:], 0.0]
+    signal = np.where(rng.random(n) < skill, np.sign(future), rng.choice([-1, 0, 1], size=n))
+    return simple_backtest(pd.DataFrame({'close': close, 'predicted_signal': signal}))
+
+def test_path_statistics():
+    stats = path_statistics([0.1, -0.5, 0.2])
+    assert stats['total_return'][0] == pytest.approx(1.1 * 0.5 * 1.2 - 1)
+    assert stats['max_drawdown'][0] == pytest.approx(-0.5)
+
+def test_reproducible_and_chunk_independent():
+    df = get_backtest_df()
+    a = backtest_monte_carlo(df, n_paths=510, chunk_size=100, seed=7, n_jobs=1)
+    b = backtest_monte_carlo(df, n_paths=510, chunk_size=100, seed=7, n_jobs=2)
+    c = backtest_monte_carlo(df, n_paths=510, chunk_size=250, seed=7, n_jobs=2)
+    d = backtest_monte_carlo(df, n_paths=510, chunk_size=10, seed=7, n_jobs=1)
+    assert a == b == c == d
+    assert backtest_monte_carlo(df, n_paths=510, chunk_size=100, seed=8, n_jobs=1) != a
+    lo, hi = a['ci']['total_return']
+    assert lo <= a['observed']['total_return'] <= hi
+
+def test_skill_detected_by_random_signal_null():
+    skilled = backtest_monte_carlo(get_backtest_df(skill=0.3), method='random_signal', n_paths=300, seed=0)
+    random = backtest_monte_carlo(get_backtest_df(skill=0.0), method='random_signal', n_paths=300, seed=0)
+    assert skilled['p_value']['sharpe'] < 0.01
+    assert random['p_value']['sharpe'] > 0.01
+    report = monte_carlo_report(skilled)
+    assert list(report.index) == ['total_return', 'sharpe', 'max_drawdown']
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        monte_carlo_test([0.01, 0.02], method='random_signal')
+    with pytest.raises(ValueError):
+        monte_carlo_test([0.01, 0.02], method='permutation')
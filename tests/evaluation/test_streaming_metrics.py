@@ -0,0 +1,65 @@
+import pandas as pd
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, confusion_matrix, classification_report
+from src.evaluation.metrics import classification_metrics
+from src.evaluation.streaming_metrics import StreamingClassificationMetrics
+
+def get_signals(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.choice([-1, 0, 1], size=n)
+    y_pred = np.where(rng.random(n) < 0.6, y_true, rng.choice([-1, 0, 1], size=n))
+    return y_true, y_pred
+
+def test_classification_metrics_match_sklearn():
+    y_true, y_pred = get_signals()
+    y_pred[y_pred == 0] = 1  # tahminlerde olmayan sınıf (zero division)
+    metrics = classification_metrics(y_true, y_pred)
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert metrics['f1'] == pytest.approx(f1_score(y_true, y_pred, average='macro'))
+    assert metrics['precision'] == pytest.approx(precision_score(y_true, y_pred, average='macro', zero_division=0))
+    assert metrics['recall'] == pytest.approx(recall_score(y_true, y_pred, average='macro'))
+    assert metrics['confusion_matrix'] == confusion_matrix(y_true, y_pred).tolist()
+    report = classification_report(y_true, y_pred, output_dict=True, zero_division=0)
+    assert metrics['report']['weighted avg']['f1-score'] == pytest.approx(report['weighted avg']['f1-score'])
+    assert metrics['report']['-1']['recall'] == pytest.approx(report['-1']['recall'])
+
+def test_streaming_batches_and_window():
+    y_true, y_pred = get_signals()
+    stream = StreamingClassificationMetrics(window=250)
+    for start in range(0, 1000, 70):
+        stream.update(y_true[start:start + 70], y_pred[start:start + 70])
+    assert stream.compute()['f1'] == pytest.approx(f1_score(y_true, y_pred, average='macro'))
+    window = stream.compute_window()
+    assert window['n'] == 250
+    assert window['accuracy'] == pytest.approx(accuracy_score(y_true[-250:], y_pred[-250:]))
+    # Tek tek bar güncellemesi
+    for t, p in zip(y_true[:10], y_pred[:10]):
+        stream.update(t, p)
+    assert stream.compute_window()['confusion_matrix'] == confusion_matrix(
+        np.r_[y_true[-240:], y_true[:10]], np.r_[y_pred[-240:], y_pred[:10]]).tolist()
+
+def test_period_breakdown():
+    y_true, y_pred = get_signals(96)
+    ts = pd.date_range('2025-01-01', periods=96, freq='h')
+    stream = StreamingClassificationMetrics(period='D')
+    stream.update(y_true[:50], y_pred[:50], timestamps=ts[:50])
+    stream.update(y_true[50:], y_pred[50:], timestamps=ts[50:])
+    periods = stream.period_metrics()
+    assert list(periods.index) == ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04']
+    assert periods['n'].tolist() == [24, 24, 24, 24]
+    assert periods.loc['2025-01-02', 'accuracy'] == pytest.approx(accuracy_score(y_true[24:48], y_pred[24:48]))
+    with pytest.raises(ValueError):
+        stream.update([2], [1], timestamps=ts[:1])
+
+def test_invalid_batches_leave_state_untouched():
+    stream = StreamingClassificationMetrics(labels=(0, 1), window=5, period='D')
+    with pytest.raises(ValueError):
+        stream.update([0, 1], [0, 1])
+    with pytest.raises(ValueError):
+        stream.update([0, 1, 1], [1], timestamps=pd.date_range('2024-01-01', periods=3, freq='h'))
+    with pytest.raises(ValueError):
+        stream.update([0, 1], [0, 1], timestamps=pd.date_range('2024-01-01', periods=3, freq='h'))
+    assert stream.compute()['n'] == 0 and stream.compute_window()['n'] == 0 and not stream.period_confusion
+    with pytest.raises(ValueError):
+        classification_metrics([0, 1, 1], [1])
@@ -0,0 +1,61 @@
+import pandas as pd
+import numpy as np
+import pytest
+from src.models.model_factory import get_model
+from src.models.flat_forest import FlatForestPredictor
+
+def get_sample_xy(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f'f{i}' for i in range(6)])
+    y = np.where(X['f0'] + 0.5 * X['f1'] > 0.3, 1, np.where(X['f0'] < -0.5, -1, 0))
+    return X, pd.Series(y)
+
+def test_flat_backend_matches_sklearn_classifier():
+    X, y = get_sample_xy()
+    model = get_model('random_forest', n_estimators=25, random_state=0).fit(X, y)
+    X_new, _ = get_sample_xy(200, seed=1)
+    flat = model.compile()
+    np.testing.assert_array_equal(model.predict(X_new, backend='flat'), model.predict(X_new))
+    np.testing.assert_allclose(flat.predict_proba(X_new), model.model.predict_proba(X_new), rtol=0, atol=1e-12)
+    # Tek satır (canlı kullanım)
+    assert model.predict(X_new.values[0], backend='flat')[0] == model.predict(X_new.iloc[[0]])[0]
+
+def test_flat_backend_matches_sklearn_regressor():
+    X, y = get_sample_xy()
+    model = get_model('random_forest', task='regression', n_estimators=10, max_depth=6, random_state=0,
+                      predict_backend='flat').fit(X, X['f0'] * 2)
+    np.testing.assert_allclose(model.predict(X), model.model.predict(X), rtol=1e-12)
+
+def test_unfitted_and_bad_backend():
+    with pytest.raises(ValueError):
+        FlatForestPredictor(get_model('random_forest').model)
+    with pytest.raises(ValueError):
+        get_model('random_forest', predict_backend='onnx')
+    X, y = get_sample_xy(100)
+    model = get_model('random_forest', n_estimators=3, random_state=0).fit(X, y)
+    with pytest.raises(ValueError):
+        model.predict(X, backend='onnx')
+
+def test_flat_backend_routes_missing_values_like_sklearn():
+    X, y = get_sample_xy()
+    X_nan = X.copy()
+    X_nan.iloc[::7, 0] = np.nan  # eğitimde eksik değer: düğüm başına yön öğrenilir
+    X_new, _ = get_sample_xy(300, seed=2)
+    X_new.iloc[::3, 0] = np.nan
+    X_new.iloc[::5, 1] = np.nan
+    for train in (X, X_nan):
+        model = get_model('random_forest', n_estimators=20, random_state=0).fit(train, y)
+        np.testing.assert_array_equal(model.predict(X_new, backend='flat'), model.predict(X_new))
+    with pytest.raises(ValueError):
+        model.predict(X_new.replace(np.nan, np.inf), backend='flat')
+
+def test_flat_backend_matches_columns_by_name():
+    X, y = get_sample_xy()
+    model = get_model('random_forest', n_estimators=10, random_state=0).fit(X, y)
+    X_new, _ = get_sample_xy(500, seed=3)
+    reordered = X_new[X_new.columns[::-1]]
+    np.testing.assert_array_equal(model.predict(reordered, backend='flat'), model.predict(X_new))
+    with pytest.raises(ValueError):
+        model.predict(X_new.rename(columns={'f0': 'a'}), backend='flat')
+    # Kolon adı olmayan diziler sırayla eşlenir
+    np.testing.assert_array_equal(model.predict(X_new.values, backend='flat'), model.predict(X_new))
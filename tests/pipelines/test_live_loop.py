@@ -0,0 +1,139 @@
+import asyncio
+import pandas as pd
+import numpy as np
+import pytest
+from src.data.data_fetcher import DataFetcher
+from src.data.data_processor import DataProcessor
+from src.data.exchange_backends import SyntheticExchangeBackend
+from src.data.label_generator import PriceDirectionLabelGenerator
+from src.models.model_factory import get_model
+from src.pipelines.live_loop import LiveSignalLoop, SimulatedClock
+
+START_MS = 1_700_000_000_000 + 17 * 60_000  # bar ortasında başla
+STEPS = ['add_indicators']
+PARAMS = {'add_indicators': {'indicators': ['rsi', 'ema', 'sma']}}
+
+def train_model(fetcher):
+    df = fetcher.fetch_data('BTC/USDT', '1h', limit=400)
+    df = DataProcessor(STEPS).process(df, PARAMS).dropna()
+    y = PriceDirectionLabelGenerator().generate(df, n=1, threshold=0.001)
+    X = df.drop(columns=['timestamp'])
+    return get_model('random_forest', n_estimators=10, random_state=0, predict_backend='flat').fit(X, y)
+
+def make_loop(tmp_path, streams):
+    clock = SimulatedClock(START_MS)
+    fetcher = DataFetcher('binance', backend=SyntheticExchangeBackend(now_fn=clock.now_ms))
+    model = train_model(fetcher)
+    return LiveSignalLoop(fetcher, model, streams, process_steps=STEPS, process_params=PARAMS,
+                          output_dir=str(tmp_path), run_id='test', clock=clock)
+
+def test_live_loop_scores_each_bar_close(tmp_path):
+    loop = make_loop(tmp_path, [('BTC/USDT', '15m'), ('ETH/USDT', '1h')])
+    ticks = pd.DataFrame(asyncio.run(loop.run(until_ms=START_MS + 3 * 3_600_000)))
+    assert (ticks['status'] == 'ok').all()
+    assert (ticks['n_bars'] == 1).all()
+    assert (ticks['bar_close'] % 900_000 == 0).all()
+    assert len(ticks[ticks['timeframe'] == '15m']) == 12
+    assert len(ticks[ticks['timeframe'] == '1h']) == 3
+    assert (ticks['latency_ms'] >= loop.close_delay_ms).all()
+    signals = pd.read_csv(tmp_path / 'signals_random_forest_test.csv')
+    assert len(signals) == 15
+    assert set(signals['predicted_signal']) <= {-1, 0, 1}
+    # Her sinyal, kapanışı tetikleyen barın kendisi için
+    eth = signals[signals['symbol'] == 'ETH/USDT']
+    expected = pd.to_datetime(ticks.loc[ticks['symbol'] == 'ETH/USDT', 'bar_close'] - 3_600_000, unit='ms')
+    assert list(pd.to_datetime(eth['timestamp'], format='ISO8601')) == list(expected)
+
+def test_live_loop_survives_fetch_errors(tmp_path):
+    loop = make_loop(tmp_path, [('BTC/USDT', '1h')])
+    asyncio.run(loop.bootstrap())
+    original = loop.fetcher.fetch_latest
+    loop.fetcher.fetch_latest = lambda *a, **k: (_ for _ in ()).throw(RuntimeError('down'))
+    asyncio.run(loop.run(max_ticks=1))
+    loop.fetcher.fetch_latest = original
+    asyncio.run(loop.run(max_ticks=1))
+    status = loop.latency_frame()['status'].tolist()
+    assert status[0].startswith('error') and status[1] == 'ok'
+    # Hata sonrası kaçırılan bar da yakalanır
+    assert loop.latency_frame()['n_bars'].tolist() == [0, 2]
+
+def test_live_loop_reuses_training_scaler(tmp_path):
+    steps = ['add_indicators', 'scale']
+    params = {'add_indicators': {'indicators': ['rsi', 'sma']}, 'scale': {'scaler_type': 'minmax'}}
+    clock = SimulatedClock(START_MS)
+    fetcher = DataFetcher('binance', backend=SyntheticExchangeBackend(now_fn=clock.now_ms))
+    history = fetcher.fetch_data('BTC/USDT', '1h', limit=400)
+    processor = DataProcessor(steps)
+    df = processor.process(history.copy(), params).dropna()
+    y = PriceDirectionLabelGenerator().generate(df, n=1, threshold=0.001)
+    model = get_model('random_forest', n_estimators=10, random_state=0).fit(df.drop(columns=['timestamp']), y)
+    processor.save_state(str(tmp_path / 'processor.pkl'))
+    # Eğitim ölçeği olmadan scale reddedilir
+    with pytest.raises(ValueError):
+        LiveSignalLoop(fetcher, model, [('BTC/USDT', '1h')], process_steps=steps, process_params=params, clock=clock)
+    loaded = DataProcessor.load_state(str(tmp_path / 'processor.pkl'))
+    loop = LiveSignalLoop(fetcher, model, [('BTC/USDT', '1h')], process_params=params, processor=loaded,
+                          output_dir=str(tmp_path), run_id='test', clock=clock, warmup=50)
+    asyncio.run(loop.run(max_ticks=3))
+    signals = pd.read_csv(tmp_path / 'signals_random_forest_test.csv')
+    assert len(signals) == 3
+    # Beklenen: tüm geçmişte eğitim scaler'ı ile hesaplanan özellikler
+    full = fetcher.fetch_data('BTC/USDT', '1h', limit=500)
+    features = DataProcessor(steps, fitted=processor.fitted).process(full, params)
+    features = features.set_index('timestamp').loc[pd.to_datetime(signals['timestamp'], format='ISO8601')]
+    expected = model.predict(features.reset_index()[loop.feature_columns])
+    assert list(signals['predicted_signal']) == list(expected)
+    assert loop.processor.fitted['scale'][0] is loaded.fitted['scale'][0]
+
+def test_live_loop_skips_remove_outliers():
+    processor = LiveSignalLoop._live_processor(DataProcessor(['fillna', 'remove_outliers', 'add_indicators']))
+    assert processor.steps == ['fillna', 'add_indicators']
+
+def test_bootstrap_without_closed_bars_raises(tmp_path):
+    loop = make_loop(tmp_path, [('BTC/USDT', '1h')])
+    loop.fetcher.fetch_data = lambda *a, **k: pd.DataFrame({'timestamp': pd.to_datetime([], unit='ms'), 'close': []})
+    with pytest.raises(ValueError, match='BTC/USDT 1h'):
+        asyncio.run(loop.bootstrap())
+
+def test_processor_lookback_covers_longest_window():
+    assert DataProcessor(['add_feature_bank']).lookback({}) == 4 * 200
+    assert DataProcessor(STEPS).lookback(PARAMS) == 4 * 14
+    # Zincirlenen adımlar: rsi (15 bar) üstüne 3 lag
+    steps = ['fillna', 'add_indicators', 'add_lagged_features']
+    params = {'add_indicators': {'indicators': ['rsi', 'sma']}, 'add_lagged_features': {'columns': ['rsi'], 'lags': 3}}
+    assert DataProcessor(steps).lookback(params) == 18
+
+def test_live_loop_warmup_follows_feature_bank(tmp_path):
+    steps = ['add_feature_bank']
+    params = {'add_feature_bank': {'windows': [5, 20], 'families': ['ema', 'volatility', 'macd']}}
+    clock = SimulatedClock(START_MS)
+    fetcher = DataFetcher('binance', backend=SyntheticExchangeBackend(now_fn=clock.now_ms))
+    df = DataProcessor(steps).process(fetcher.fetch_data('BTC/USDT', '1h', limit=400), params).dropna()
+    y = PriceDirectionLabelGenerator().generate(df, n=1, threshold=0.001)
+    model = get_model('random_forest', n_estimators=10, random_state=0).fit(df.drop(columns=['timestamp']), y)
+    with pytest.raises(ValueError, match='lookback'):
+        LiveSignalLoop(fetcher, model, [('BTC/USDT', '1h')], process_steps=steps, process_params=params,
+                       clock=clock, warmup=50)
+    loop = LiveSignalLoop(fetcher, model, [('BTC/USDT', '1h')], process_steps=steps, process_params=params,
+                          output_dir=str(tmp_path), run_id='test', clock=clock)
+    assert loop.warmup == 80
+    asyncio.run(loop.run(max_ticks=3))
+    signals = pd.read_csv(tmp_path / 'signals_random_forest_test.csv')
+    full = DataProcessor(steps).process(fetcher.fetch_data('BTC/USDT', '1h', limit=500), params)
+    live = full.set_index('timestamp').loc[pd.to_datetime(signals['timestamp'], format='ISO8601')].reset_index()
+    assert list(signals['predicted_signal']) == list(model.predict(live[loop.feature_columns]))
+
+def test_live_loop_skips_non_finite_features(tmp_path):
+    loop = make_loop(tmp_path, [('BTC/USDT', '1h')])
+    asyncio.run(loop.bootstrap())
+    original = loop.fetcher.fetch_latest
+    def broken_close(*args, **kwargs):
+        df = original(*args, **kwargs)
+        df['close'] = np.nan
+        return df
+    loop.fetcher.fetch_latest = broken_close
+    asyncio.run(loop.run(max_ticks=1))
+    record = loop.latency_frame().iloc[-1]
+    assert record['status'] == 'non_finite_features'
+    assert record['n_bars'] == 0 and record['n_skipped'] == 1
+    assert not (tmp_path / 'signals_random_forest_test.csv').exists()
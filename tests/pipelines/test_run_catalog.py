@@ -0,0 +1,78 @@
+import json
+import os
+import pandas as pd
+import numpy as np
+import pytest
+from src.cli import main
+from src.data.exchange_backends import RecordingBackend, SyntheticExchangeBackend
+from src.pipelines.full_pipeline import run_full_pipeline
+from src.pipelines.run_catalog import RunCatalog, RunCatalogException
+
+def make_catalog(tmp_path, n=30):
+    catalog = RunCatalog(str(tmp_path / 'catalog.sqlite'))
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        catalog.record_run(str(tmp_path / f'random_forest_202501{i % 28 + 1:02d}_1200{i:02d}'),
+                           config={'symbol': 'BTC/USDT' if i % 2 else 'ETH/USDT', 'timeframe': '1h'},
+                           metrics={'accuracy': rng.random(), 'f1': rng.random()},
+                           backtest={'sharpe': rng.normal()}, timings={'total': 1.0 + i})
+    return catalog
+
+def test_query_filters_and_order(tmp_path):
+    catalog = make_catalog(tmp_path)
+    df = catalog.query(filters=['symbol=BTC/USDT', 'f1>=0.3'], order_by='f1')
+    assert len(df) > 0 and (df['symbol'] == 'BTC/USDT').all() and (df['f1'] >= 0.3).all()
+    assert df['f1'].is_monotonic_decreasing
+    board = catalog.leaderboard('sharpe', limit=5)
+    assert len(board) == 5 and board['sharpe'].is_monotonic_decreasing
+    run = catalog.get(board['run_key'].iloc[0])
+    assert run['config']['timeframe'] == '1h' and run['timings']['total'] >= 1.0
+    with pytest.raises(RunCatalogException):
+        catalog.query(filters=['f1; DROP TABLE runs>=0'])
+    with pytest.raises(RunCatalogException):
+        catalog.query(order_by='f1 DESC; --')
+    # Tuple filtreleri de aynı beyaz listeden geçer
+    for bad in [('1=1) OR (1', '=', 1), ('f1', '>= 0 OR 1=1 --', 0), ('f1', '>=', 'abc')]:
+        with pytest.raises(RunCatalogException):
+            catalog.query(filters=[bad])
+    with pytest.raises(RunCatalogException):
+        catalog.query(filters=['f1>=abc'])
+    assert len(catalog.query(filters=[('symbol', '=', 'BTC/USDT'), ('f1', '>=', '0.3')])) == len(df)
+    assert main(['catalog', 'list', '--db', catalog.db_path, '--where', 'f1>=abc']) == 2
+
+def test_backfill_existing_run_dirs(tmp_path):
+    run_dir = tmp_path / 'outputs' / 'random_forest_20250101_120000'
+    run_dir.mkdir(parents=True)
+    pd.DataFrame([{'accuracy': 0.5, 'f1': 0.4, 'precision': 0.45, 'recall': 0.41}]).to_csv(run_dir / 'metrics.csv', index=False)
+    pd.DataFrame({'strategy_return': [np.nan, 0.01, -0.005], 'cum_strategy_return': [np.nan, 1.01, 1.00495]}).to_csv(run_dir / 'backtest.csv', index=False)
+    pd.DataFrame({'predicted_signal': [1, 0, 1]}).to_csv(run_dir / 'signals.csv', index=False)
+    (run_dir / 'model_meta.json').write_text(json.dumps({'params': {'n_estimators': 50}, 'task': 'classification'}))
+    (tmp_path / 'outputs' / 'not_a_run').mkdir()
+    catalog = RunCatalog(str(tmp_path / 'catalog.sqlite'))
+    assert catalog.backfill(str(tmp_path / 'outputs')) == 1
+    assert catalog.backfill(str(tmp_path / 'outputs')) == 0
+    run = catalog.get('random_forest_20250101_120000')
+    assert run['f1'] == pytest.approx(0.4) and run['n_test'] == 3
+    assert run['cum_strategy_return'] == pytest.approx(1.00495)
+    assert run['config']['model_params'] == {'n_estimators': 50}
+    assert set(run['artifacts']) == {'metrics.csv', 'backtest.csv', 'signals.csv', 'model_meta.json'}
+
+def test_pipeline_writes_catalog(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    with RecordingBackend(SyntheticExchangeBackend(), 'btc.npz') as recorder:
+        recorder.fetch_ohlcv('BTC/USDT', '1h', limit=300)
+    config = {
+        'exchange': 'binance', 'exchange_mode': 'replay', 'exchange_cassette': 'btc.npz',
+        'symbol': 'BTC/USDT', 'timeframe': '1h', 'limit': 300,
+        'process_steps': ['fillna', 'add_indicators'],
+        'process_params': {'fillna': {'method': 'bfill'}, 'add_indicators': {'indicators': ['rsi', 'ema', 'sma']}},
+        'label_threshold': 0.001, 'label_n': 1, 'test_size': 0.3,
+        'model_name': 'random_forest', 'model_params': {'n_estimators': 5, 'random_state': 0},
+    }
+    output_dir = run_full_pipeline(config)
+    run = RunCatalog().get(os.path.basename(output_dir))
+    assert run['symbol'] == 'BTC/USDT' and run['n_test'] == 90
+    assert {'fetch', 'train', 'total'} <= set(run['timings'])
+    assert {'model.pkl', 'processor.pkl'} <= set(run['artifacts'])
+    assert main(['catalog', 'leaderboard', '--metric', 'accuracy', '--where', 'symbol=BTC/USDT']) == 0
+    assert os.path.basename(output_dir) in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from src.cli import main
+from src.data.exchange_backends import RecordingBackend, BaseExchangeBackend
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/../')
+
+class FakeExchange(BaseExchangeBackend):
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        return [[1_700_000_000_000 + i * 3_600_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+@pytest.mark.parametrize('args', [['--help'], ['fetch', '--help'], ['run', '--help'], ['analyze', '--help']])
+def test_help_has_no_heavy_imports(args):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', 'main.py'] + args, cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0
+    imported = {line.split('|')[-1].strip() for line in proc.stderr.splitlines() if line.startswith('import time:')}
+    for heavy in ['pandas', 'ccxt', 'sklearn', 'matplotlib', 'seaborn', 'streamlit']:
+        assert heavy not in imported
+
+def test_no_import_side_effects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run([sys.executable, '-c', 'import src.cli, src.pipelines.full_pipeline'],
+                   cwd=tmp_path, env={**os.environ, 'PYTHONPATH': ROOT}, check=True)
+    assert not (tmp_path / 'logs').exists()
+
+def test_fetch_replay_and_legacy_flags(tmp_path, capsys):
+    cassette = str(tmp_path / 'c.npz')
+    with RecordingBackend(FakeExchange(), cassette) as recorder:
+        recorder.fetch_ohlcv('BTC/USDT', '1h', limit=30)
+    assert main(['fetch', '--replay', cassette, '--limit', '5']) == 0
+    # Eski kullanım: alt komut olmadan bayraklar fetch'e gider
+    assert main(['--replay', cassette, '--limit', '5']) == 0
+    assert 'close' in capsys.readouterr().out
+
+def test_bare_call_fetches_with_defaults(monkeypatch):
+    import src.cli as cli
+    calls = []
+    monkeypatch.setattr(cli, 'cmd_fetch', lambda args: calls.append(args) or 0)
+    assert main([]) == 0
+    assert (calls[0].exchange, calls[0].symbol, calls[0].timeframe, calls[0].limit) == ('binance', 'BTC/USDT', '1h', 100)
+
+def test_run_and_batch_report_pipeline_failures(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'missing_cassette.yaml'
+    config.write_text(open(os.path.join(ROOT, 'configs', 'default_config.yaml'), encoding='utf-8').read())
+    args = ['--exchange-mode', 'replay', '--cassette', str(tmp_path / 'missing.npz')]
+    assert main(['run', '--config', str(config)] + args) == 1
+    assert main(['batch', str(config)] + args) == 1
+    assert 'Batch finished: 0 ok, 1 failed' in capsys.readouterr().out
@@ -0,0 +1,20 @@
+import pytest
+from src.utils.timeframes import timeframe_to_ms, bar_open, next_bar_close
+
+def test_timeframe_to_ms():
+    assert timeframe_to_ms('1m') == 60_000
+    assert timeframe_to_ms('4h') == 4 * 3_600_000
+    with pytest.raises(ValueError):
+        timeframe_to_ms('1M')
+
+def test_bar_boundaries():
+    assert bar_open(3_600_000 + 5, '1h') == 3_600_000
+    assert next_bar_close(3_600_000 + 5, '1h') == 7_200_000
+    assert next_bar_close(7_200_000, '1h') == 10_800_000
+
+def test_weekly_bars_close_on_monday():
+    import pandas as pd
+    wednesday = int(pd.Timestamp('2024-01-03', tz='UTC').timestamp() * 1000)
+    assert pd.Timestamp(bar_open(wednesday, '1w'), unit='ms') == pd.Timestamp('2024-01-01')
+    assert pd.Timestamp(next_bar_close(wednesday, '1w'), unit='ms') == pd.Timestamp('2024-01-08')
+    assert pd.Timestamp(next_bar_close(wednesday, '1w'), unit='ms').day_name() == 'Monday'